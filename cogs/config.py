@@ -1,91 +1,355 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
-from typing import Optional, Literal, List
+from discord.ext import commands, tasks
+from typing import Optional, Literal, List, Callable, Any
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+import copy
 import aiohttp
+import asyncio
 import time
 import logging
+import re
+
+@dataclass(frozen=True, slots=True)
+class SettingSpec:
+    """Describes a configurable setting: its type, default and allowed range."""
+    description: str
+    default: str
+    type: type
+    min_value: Optional[int] = None
+    max_value: Optional[int] = None
+    check: Optional[Callable[[Any], bool]] = None  # Extra validation for non-numeric settings
+
+    def is_valid(self, value) -> bool:
+        """Check a converted value against the bounds and extra check."""
+        if self.min_value is not None and value < self.min_value:
+            return False
+        if self.max_value is not None and value > self.max_value:
+            return False
+        return self.check is None or self.check(value)
+
+    def bounds_message(self) -> str:
+        """Describe the allowed range for error messages."""
+        if self.min_value is not None and self.max_value is not None:
+            return f" (must be between {self.min_value} and {self.max_value})"
+        if self.min_value is not None:
+            return f" (must be at least {self.min_value})"
+        if self.max_value is not None:
+            return f" (must be at most {self.max_value})"
+        return ""
+
+# Static table of every configurable setting, grouped by category
+_VALID_SETTINGS = {
+    'economy': {
+        'starting_balance': SettingSpec('Starting balance for new users', '100', int, 0, 1000000),
+        'max_balance': SettingSpec('Maximum balance allowed', '1000000', int, 1),
+        'daily_amount': SettingSpec('Daily reward amount', '100', int, 1),
+        'weekly_amount': SettingSpec('Weekly reward amount', '1000', int, 1),
+        'min_bet': SettingSpec('Minimum bet amount', '10', int, 1),
+        'max_bet': SettingSpec('Maximum bet amount', '1000', int, 1)
+    },
+    'rewards': {
+        'message_reward': SettingSpec('Coins per message', '1', int, 0, 100),
+        'voice_reward': SettingSpec('Coins per minute in voice', '2', int, 0, 100),
+        'message_cooldown': SettingSpec('Cooldown between message rewards in seconds', '60', int, 0),
+        'voice_cooldown': SettingSpec('Cooldown between voice rewards in seconds', '300', int, 0)
+    },
+    'welcome': {
+        'channel': SettingSpec('Welcome channel ID', 'None', str),
+        'message': SettingSpec('Welcome message (use {user} for mention)', 'Welcome {user} to the server!', str),
+        'enabled': SettingSpec('Enable/disable welcome messages', 'true', bool),
+        'color': SettingSpec('Embed color (hex)', '#7289DA', str, check=lambda x: len(x) == 7 and x.startswith('#'))
+    },
+    'moderation': {
+        'mod_role': SettingSpec('Moderator role ID', 'None', str),
+        'admin_role': SettingSpec('Administrator role ID', 'None', str),
+        'mute_role': SettingSpec('Mute role ID', 'None', str),
+        'log_channel': SettingSpec('Moderation log channel ID', 'None', str)
+    },
+    'levels': {
+        'enabled': SettingSpec('Enable/disable leveling system', 'true', bool),
+        'xp_per_message': SettingSpec('XP gained per message', '15', int, 1, 100),
+        'xp_cooldown': SettingSpec('Cooldown between XP gains in seconds', '60', int, 0),
+        'level_up_channel': SettingSpec('Channel for level up announcements (None for same channel)', 'None', str)
+    }
+}
+
+_BOOL_TRUE_VALUES = frozenset({'true', 'yes', 'on', '1'})
+_BOOL_VALUES = _BOOL_TRUE_VALUES | frozenset({'false', 'no', 'off', '0'})
+
+_CATEGORY_EMOJI = {
+    "economy": "💰",
+    "rewards": "🎁",
+    "welcome": "👋",
+    "moderation": "🛡️",
+    "levels": "⭐"
+}
+
+# Defaults for a new guild, derived once from the table above
+_DEFAULT_CONFIG_TEMPLATE = {
+    category: {setting: spec.default for setting, spec in settings.items()}
+    for category, settings in _VALID_SETTINGS.items()
+}
+
+# Per-category (setting, spec, lowercase name, lowercase description) rows for autocomplete
+_SETTING_SEARCH_INDEX = {
+    category: [
+        (setting, spec, setting.lower(), spec.description.lower())
+        for setting, spec in settings.items()
+    ]
+    for category, settings in _VALID_SETTINGS.items()
+}
+
+def _build_setting_trie(settings: dict) -> dict:
+    """Build a prefix trie over setting names and the words in their descriptions.
+
+    Each node maps a character to its child node and keeps, under "$", the
+    settings reachable through it in table order, so a lookup is one step per
+    query character with no scan over the settings.
+    """
+    root = {"$": list(settings)}
+    for setting, spec in settings.items():
+        words = {setting.lower(), *re.findall(r"[a-z0-9]+", f"{setting} {spec.description}".lower())}
+        for word in words:
+            node = root
+            for char in word:
+                node = node.setdefault(char, {"$": []})
+                if not node["$"] or node["$"][-1] != setting:
+                    node["$"].append(setting)
+    return root
+
+_SETTING_TRIES = {category: _build_setting_trie(settings) for category, settings in _VALID_SETTINGS.items()}
+
+# Permissions requested by the invite link
+_INVITE_PERMISSIONS = discord.Permissions(
+    # Moderation permissions
+    kick_members=True,
+    ban_members=True,
+    moderate_members=True,
+    manage_messages=True,
+    manage_threads=True,
+
+    # Channel permissions
+    manage_channels=True,
+    manage_roles=True,
+    manage_webhooks=True,
+    view_channel=True,
+
+    # Message permissions
+    send_messages=True,
+    send_messages_in_threads=True,
+    create_public_threads=True,
+    embed_links=True,
+    attach_files=True,
+    add_reactions=True,
+    use_external_emojis=True,
+    use_external_stickers=True,
+    read_message_history=True,
+    mention_everyone=True,
+
+    # Voice permissions
+    connect=True,
+    speak=True,
+    mute_members=True,
+    deafen_members=True,
+    move_members=True,
+    use_voice_activation=True,
+)
+
+_VIEWCONFIG_DESCRIPTION = (
+    "Use the specific configuration commands to modify these settings:\n"
+    "• `/automod` - For moderation settings\n"
+    "• `/gameconfig` - For game settings\n"
+    "• `/botappearance` - For bot appearance\n"
+    "• `/viewconfig` - To view current settings"
+)
+
+_INVITE_FEATURES = (
+    "**Why choose Strwbrry Jam Bot?**\n"
+    "• 🛡️ Advanced moderation & auto-moderation\n"
+    "• 💰 Fun economy system with games\n"
+    "• ⭐ XP system with role rewards\n"
+    "• 🎮 Interactive mini-games\n"
+    "• 🎫 Support ticket system\n"
+    "• 👋 Customizable welcome messages\n"
+    "• 📊 Detailed server statistics\n"
+)
+
+# (name, value, inline) for the static fields of the invite embed
+_INVITE_FIELDS = (
+    (
+        "🛡️ Moderation Features",
+        "• Warning system with infractions tracking\n"
+        "• Temporary & permanent bans\n"
+        "• Advanced auto-moderation\n"
+        "• Detailed logging system",
+        True
+    ),
+    (
+        "🎮 Fun & Games",
+        "• Economy system with shop\n"
+        "• Interactive mini-games\n"
+        "• Trivia challenges\n"
+        "• Giveaway system",
+        True
+    ),
+    (
+        "🔗 Quick Links",
+        "[Support Server](https://discord.gg/your-support-server)\n"
+        "[Documentation](https://docs.your-bot-website.com)\n"
+        "[Top.gg Page](https://top.gg/your-bot)\n"
+        "[GitHub](https://github.com/your-username/strwbrry_jam_bot)",
+        False
+    ),
+)
 
 class Config(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.data_type = "config"
-        self._config_cache = {}  # guild_id -> (config, timestamp)
+        self._config_cache = OrderedDict()  # guild_id -> (config, timestamp), least recently used first
         self.cache_ttl = 300  # 5 minutes
+        self.cache_max_size = 2048
+        self._no_appearance_guilds = set()  # Guilds known to have no custom appearance
+        self._webhook_cache = OrderedDict()  # channel_id -> discord.Webhook, least recently used first
+        self.webhook_cache_max_size = 512
+        self._appearance_error_times = {}  # channel_id -> last time an appearance failure was logged
+        self.session = None  # Shared aiohttp session for avatar URL checks
+        self._invite_url = None
+        self._invite_embed = None
+        self._stats_cache = None  # ((guilds, users, commands), timestamp) for /invite
+        self.stats_cache_ttl = 60
+        self._dirty_configs = {}  # guild_id -> latest config not yet written to storage
+        self._flush_tasks = {}  # guild_id -> task that will write that guild's dirty config
+        self.config_flush_delay = 0.5  # seconds to collect further changes before writing
+        self.config_retry_delay = 30  # seconds before retrying a failed config write
+        self._flush_now = asyncio.Event()  # Set on unload so pending flushes write without waiting
+        self._image_url_cache = OrderedDict()  # avatar URL -> time it last validated, least recently used first
+        self.image_url_cache_ttl = 3600  # 1 hour
+        self.image_url_cache_max_size = 256
         self.logger = logging.getLogger(__name__)
+        self.valid_settings = _VALID_SETTINGS
 
     async def cog_load(self):
         """Initialize the cog"""
-        self.valid_settings = {
-            'economy': {
-                'starting_balance': ('Starting balance for new users', '100', int, lambda x: 0 <= x <= 1000000),
-                'max_balance': ('Maximum balance allowed', '1000000', int, lambda x: x > 0),
-                'daily_amount': ('Daily reward amount', '100', int, lambda x: x > 0),
-                'weekly_amount': ('Weekly reward amount', '1000', int, lambda x: x > 0),
-                'min_bet': ('Minimum bet amount', '10', int, lambda x: x > 0),
-                'max_bet': ('Maximum bet amount', '1000', int, lambda x: x > 0)
-            },
-            'rewards': {
-                'message_reward': ('Coins per message', '1', int, lambda x: 0 <= x <= 100),
-                'voice_reward': ('Coins per minute in voice', '2', int, lambda x: 0 <= x <= 100),
-                'message_cooldown': ('Cooldown between message rewards in seconds', '60', int, lambda x: x >= 0),
-                'voice_cooldown': ('Cooldown between voice rewards in seconds', '300', int, lambda x: x >= 0)
-            },
-            'welcome': {
-                'channel': ('Welcome channel ID', 'None', str, None),
-                'message': ('Welcome message (use {user} for mention)', 'Welcome {user} to the server!', str, None),
-                'enabled': ('Enable/disable welcome messages', 'true', bool, None),
-                'color': ('Embed color (hex)', '#7289DA', str, lambda x: len(x) == 7 and x.startswith('#'))
-            },
-            'moderation': {
-                'mod_role': ('Moderator role ID', 'None', str, None),
-                'admin_role': ('Administrator role ID', 'None', str, None),
-                'mute_role': ('Mute role ID', 'None', str, None),
-                'log_channel': ('Moderation log channel ID', 'None', str, None)
-            },
-            'levels': {
-                'enabled': ('Enable/disable leveling system', 'true', bool, None),
-                'xp_per_message': ('XP gained per message', '15', int, lambda x: 1 <= x <= 100),
-                'xp_cooldown': ('Cooldown between XP gains in seconds', '60', int, lambda x: x >= 0),
-                'level_up_channel': ('Channel for level up announcements (None for same channel)', 'None', str, None)
-            }
-        }
+        # Avatar probes only need headers, so don't let a slow host stall the command
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5))
+        if self.bot.user:
+            self._build_invite()
+        self.sweep_config_cache.start()
+
+    async def cog_unload(self):
+        """Cleanup when cog is unloaded."""
+        self.sweep_config_cache.cancel()
+        # Wake pending flushes so they write now instead of after their delay
+        self._flush_now.set()
+        while self._flush_tasks:
+            await asyncio.gather(*list(self._flush_tasks.values()), return_exceptions=True)
+        # Configs whose write just failed get one last attempt
+        for guild_id, config in list(self._dirty_configs.items()):
+            try:
+                await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, self.data_type, config)
+                del self._dirty_configs[guild_id]
+            except Exception as e:
+                self.logger.error(f"Error saving config for guild {guild_id} on unload: {e}")
+        if self.session:
+            await self.session.close()
 
     def _get_config(self, guild_id: int) -> dict:
-        """Get configuration for a specific guild with caching."""
+        """Get the cached configuration for a guild; callers must not mutate it."""
         current_time = time.time()
         
         # Check cache first
         if guild_id in self._config_cache:
             config, timestamp = self._config_cache[guild_id]
             if current_time - timestamp < self.cache_ttl:
-                return config.copy()  # Return a copy to prevent mutations
+                self._config_cache.move_to_end(guild_id)
+                return config
         
         try:
-            # Load from storage
-            data = self.bot.data_manager.load_data(guild_id, self.data_type)
-            
-            # Update cache
-            self._config_cache[guild_id] = (data, current_time)
-            
-            return data.copy()
+            # Load from storage, unless a newer config is still waiting to be written
+            data = self._dirty_configs.get(guild_id)
+            if data is None:
+                data = self.bot.data_manager.load_data(guild_id, self.data_type)
         except FileNotFoundError:
             # Create default config
             data = self._create_default_config()
             self.bot.data_manager.save_data(guild_id, self.data_type, data)
-            self._config_cache[guild_id] = (data, current_time)
-            return data.copy()
+        self._cache_config(guild_id, data)
+        return data
+
+    def _get_config_readonly(self, guild_id: int) -> MappingProxyType:
+        """Get a read-only view of a guild's configuration without copying it."""
+        return MappingProxyType(self._get_config(guild_id))
+
+    def _get_config_mutable(self, guild_id: int) -> dict:
+        """Get a private copy of a guild's configuration for editing."""
+        return copy.deepcopy(self._get_config(guild_id))
+
+    def _cache_config(self, guild_id: int, config: dict):
+        """Store a guild's config in the cache, evicting the least recently used entry when full."""
+        # Keep the appearance negative cache in step with every config the cog sees
+        if config.get("appearance"):
+            self._no_appearance_guilds.discard(guild_id)
+        else:
+            self._no_appearance_guilds.add(guild_id)
+        self._config_cache[guild_id] = (config, time.time())
+        self._config_cache.move_to_end(guild_id)
+        if len(self._config_cache) > self.cache_max_size:
+            self._config_cache.popitem(last=False)
+
+    def _save_config(self, guild_id: int, config: dict):
+        """Cache a guild's new config now and write it to storage shortly after.
+
+        Changes made within config_flush_delay of each other are coalesced
+        into a single write of the latest config.
+        """
+        self._cache_config(guild_id, config)
+        self._dirty_configs[guild_id] = config
+        if guild_id not in self._flush_tasks:
+            self._flush_tasks[guild_id] = asyncio.create_task(self._flush_config_later(guild_id))
+
+    async def _flush_config_later(self, guild_id: int, delay: Optional[float] = None):
+        """Write a guild's dirty config after the flush delay, retrying later if the write fails."""
+        config = None
+        retry_delay = None
+        try:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self.config_flush_delay if delay is None else delay)
+            except asyncio.TimeoutError:
+                pass
+            config = self._dirty_configs.pop(guild_id, None)
+            if config is not None:
+                await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, self.data_type, config)
+        except Exception as e:
+            self.logger.error(f"Error saving config for guild {guild_id}: {e}")
+            if config is not None:
+                # Keep the unwritten config pending unless a newer change has replaced it
+                self._dirty_configs.setdefault(guild_id, config)
+                retry_delay = self.config_retry_delay
+        finally:
+            del self._flush_tasks[guild_id]
+            # A change made while this write was running, or a failed write, still needs its own write.
+            # On unload, cog_unload writes whatever is left instead.
+            if guild_id in self._dirty_configs and not self._flush_now.is_set():
+                self._flush_tasks[guild_id] = asyncio.create_task(self._flush_config_later(guild_id, retry_delay))
+
+    @tasks.loop(minutes=5)
+    async def sweep_config_cache(self):
+        """Drop cached configs whose TTL has expired."""
+        cutoff = time.time() - self.cache_ttl
+        expired = [guild_id for guild_id, (_, timestamp) in self._config_cache.items() if timestamp < cutoff]
+        for guild_id in expired:
+            del self._config_cache[guild_id]
 
     def _create_default_config(self) -> dict:
         """Create default configuration"""
-        config = {}
-        for category, settings in self.valid_settings.items():
-            config[category] = {
-                setting: info[1] for setting, info in settings.items()
-            }
-        return config
-
-    async def _validate_setting(self, category: str, setting: str, value: str) -> tuple[bool, str, any]:
+        # Defaults are all strings, so copying each category dict is a full copy
+        return {category: dict(settings) for category, settings in _DEFAULT_CONFIG_TEMPLATE.items()}
+
+    def _validate_setting(self, category: str, setting: str, value: str) -> tuple[bool, str, any]:
         """Validate a setting value with detailed error messages"""
         if category not in self.valid_settings:
             return False, f"❌ Invalid category: `{category}`\nValid categories: {', '.join(f'`{c}`' for c in self.valid_settings.keys())}", None
@@ -93,55 +357,23 @@ class Config(commands.Cog):
         if setting not in self.valid_settings[category]:
             return False, f"❌ Invalid setting: `{setting}`\nValid settings for {category}: {', '.join(f'`{s}`' for s in self.valid_settings[category].keys())}", None
             
-        setting_info = self.valid_settings[category][setting]
-        value_type = setting_info[2]
-        validator = setting_info[3]
-        description = setting_info[0]
+        spec = self.valid_settings[category][setting]
+        value_type = spec.type
         
         try:
             # Convert value to correct type
             if value_type == bool:
-                if value.lower() not in ['true', 'false', 'yes', 'no', 'on', 'off', '1', '0']:
+                lowered = value.lower()
+                if lowered not in _BOOL_VALUES:
                     return False, f"❌ Invalid boolean value: `{value}`\nPlease use: true/false, yes/no, on/off, or 1/0", None
-                typed_value = value.lower() in ['true', 'yes', 'on', '1']
+                typed_value = lowered in _BOOL_TRUE_VALUES
             else:
                 typed_value = value_type(value)
             
-            # Validate if validator exists
-            if validator and not validator(typed_value):
+            if not spec.is_valid(typed_value):
                 if value_type == int:
-                    # Get validator bounds
-                    test_val = -1
-                    lower_bound = None
-                    while True:
-                        if validator(test_val):
-                            lower_bound = test_val
-                            break
-                        if test_val < -1000000:  # Prevent infinite loop
-                            break
-                        test_val -= 1
-                    
-                    test_val = 1
-                    upper_bound = None
-                    while True:
-                        if validator(test_val):
-                            upper_bound = test_val
-                            break
-                        if test_val > 1000000:  # Prevent infinite loop
-                            break
-                        test_val += 1
-                    
-                    bounds_msg = ""
-                    if lower_bound is not None and upper_bound is not None:
-                        bounds_msg = f" (must be between {lower_bound} and {upper_bound})"
-                    elif lower_bound is not None:
-                        bounds_msg = f" (must be at least {lower_bound})"
-                    elif upper_bound is not None:
-                        bounds_msg = f" (must be at most {upper_bound})"
-                    
-                    return False, f"❌ Invalid value: `{value}`{bounds_msg}", None
-                else:
-                    return False, f"❌ Invalid value: `{value}` (doesn't meet requirements for {description})", None
+                    return False, f"❌ Invalid value: `{value}`{spec.bounds_message()}", None
+                return False, f"❌ Invalid value: `{value}` (doesn't meet requirements for {spec.description})", None
                 
             return True, "", typed_value
             
@@ -162,19 +394,33 @@ class Config(commands.Cog):
             if not category:
                 return []
 
-            # Get valid settings for the category
-            settings = self.valid_settings.get(category, {})
+            # Filter choices based on current input
+            query = current.lower()
+            node = _SETTING_TRIES.get(category)
+            for char in query:
+                if node is None or char == "$":
+                    node = None
+                    break
+                node = node.get(char)
+            
+            # Prefix matches on a setting name or description word come first
+            settings = self.valid_settings[category]
+            matches = list(node["$"][:25]) if node is not None else []  # Discord has a limit of 25 choices
+            
+            # Then any other substring hits, for mid-word or multi-word queries
+            if len(matches) < 25:
+                seen = set(matches)
+                for setting, spec, name_lower, desc_lower in _SETTING_SEARCH_INDEX.get(category, ()):
+                    if setting not in seen and (query in name_lower or query in desc_lower):
+                        matches.append(setting)
+                        if len(matches) == 25:
+                            break
             
-            # Filter and sort choices based on current input
             choices = [
-                app_commands.Choice(
-                    name=f"{setting} - {desc[0]}", 
-                    value=setting
-                )
-                for setting, desc in settings.items()
-                if current.lower() in setting.lower() or current.lower() in desc[0].lower()
+                app_commands.Choice(name=f"{setting} - {settings[setting].description}", value=setting)
+                for setting in matches
             ]
-            return choices[:25]  # Discord has a limit of 25 choices
+            return choices
         except Exception:
             return []
 
@@ -183,7 +429,7 @@ class Config(commands.Cog):
     async def view_config(self, interaction: discord.Interaction, category: Optional[str] = None):
         """View the current configuration for this server."""
         try:
-            config = self._get_config(interaction.guild_id)
+            config = self._get_config_readonly(interaction.guild_id)
             
             if not config:
                 await interaction.response.send_message("❌ No configuration set for this server.", ephemeral=True)
@@ -199,7 +445,7 @@ class Config(commands.Cog):
 
             embed = discord.Embed(
                 title="🔧 Server Configuration",
-                description="Use the specific configuration commands to modify these settings:\n• `/automod` - For moderation settings\n• `/gameconfig` - For game settings\n• `/botappearance` - For bot appearance\n• `/viewconfig` - To view current settings",
+                description=_VIEWCONFIG_DESCRIPTION,
                 color=discord.Color.blue()
             )
 
@@ -211,7 +457,7 @@ class Config(commands.Cog):
                     # Get descriptions for each setting
                     setting_lines = []
                     for k, v in settings.items():
-                        desc = self.valid_settings[cat][k][0] if cat in self.valid_settings and k in self.valid_settings[cat] else "No description"
+                        desc = self.valid_settings[cat][k].description if cat in self.valid_settings and k in self.valid_settings[cat] else "No description"
                         setting_lines.append(f"• `{k}`: {v}\n  ↳ {desc}")
                     value = "\n".join(setting_lines)
                 else:
@@ -287,13 +533,13 @@ class Config(commands.Cog):
                 return
 
             # Validate setting
-            valid, error_msg, typed_value = await self._validate_setting(category, setting, value)
+            valid, error_msg, typed_value = self._validate_setting(category, setting, value)
             if not valid:
                 await interaction.response.send_message(error_msg, ephemeral=True)
                 return
 
             # Get and update config
-            config = self._get_config(interaction.guild_id)
+            config = self._get_config_mutable(interaction.guild_id)
             if category not in config:
                 config[category] = {}
             
@@ -301,20 +547,11 @@ class Config(commands.Cog):
             config[category][setting] = typed_value
             
             # Save config
-            try:
-                self.bot.data_manager.save_data(interaction.guild_id, self.data_type, config)
-                self._config_cache[interaction.guild_id] = (config, time.time())
-            except Exception as e:
-                self.logger.error(f"Error saving config: {e}")
-                await interaction.response.send_message(
-                    "❌ Failed to save configuration. Please try again later.",
-                    ephemeral=True
-                )
-                return
+            self._save_config(interaction.guild_id, config)
             
             # Get setting description and emoji
-            setting_desc = self.valid_settings[category][setting][0]
-            category_emoji = next((c.name.split()[0] for c in self.config.choices if c.value == category), "📝")
+            setting_desc = self.valid_settings[category][setting].description
+            category_emoji = _CATEGORY_EMOJI.get(category, "📝")
             
             embed = discord.Embed(
                 title=f"{category_emoji} Configuration Updated",
@@ -379,6 +616,11 @@ class Config(commands.Cog):
 
     async def _get_or_create_webhook(self, channel: discord.TextChannel) -> discord.Webhook:
         """Get existing webhook or create a new one."""
+        webhook = self._webhook_cache.get(channel.id)
+        if webhook is not None:
+            self._webhook_cache.move_to_end(channel.id)
+            return webhook
+        
         # Look for existing webhook
         webhooks = await channel.webhooks()
         webhook = discord.utils.get(webhooks, name="CustomBotHook", user=self.bot.user)
@@ -387,8 +629,45 @@ class Config(commands.Cog):
         if webhook is None:
             webhook = await channel.create_webhook(name="CustomBotHook")
         
+        self._webhook_cache[channel.id] = webhook
+        if len(self._webhook_cache) > self.webhook_cache_max_size:
+            self._webhook_cache.popitem(last=False)
         return webhook
 
+    def _is_known_image_url(self, url: str) -> bool:
+        """Check whether a URL passed avatar validation within the TTL."""
+        validated_at = self._image_url_cache.get(url)
+        if validated_at is None:
+            return False
+        if time.time() - validated_at >= self.image_url_cache_ttl:
+            del self._image_url_cache[url]
+            return False
+        self._image_url_cache.move_to_end(url)
+        return True
+
+    def _remember_image_url(self, url: str):
+        """Record a URL that passed avatar validation, evicting the least recently used entry when full."""
+        self._image_url_cache[url] = time.time()
+        self._image_url_cache.move_to_end(url)
+        if len(self._image_url_cache) > self.image_url_cache_max_size:
+            self._image_url_cache.popitem(last=False)
+
+    async def _probe_image_url(self, url: str) -> tuple:
+        """Return (status, content-type) for a URL without downloading its body."""
+        async with self.session.head(url, allow_redirects=True) as resp:
+            if resp.status not in (403, 405, 501):
+                return resp.status, resp.headers.get("content-type", "")
+
+        # Some CDNs refuse HEAD; ask for a single byte instead
+        async with self.session.get(url, headers={"Range": "bytes=0-0"}, allow_redirects=True) as resp:
+            if resp.status == 416:
+                # Range not satisfiable; retry without it and read only a small prefix
+                async with self.session.get(url, allow_redirects=True) as full:
+                    await full.content.read(512)
+                    return full.status, full.headers.get("content-type", "")
+            # If the server ignored Range, leaving the block releases the body unread
+            return resp.status, resp.headers.get("content-type", "")
+
     @app_commands.command(name="botappearance", description="Customize the bot's name and avatar for this server")
     @app_commands.checks.has_permissions(administrator=True)
     async def set_bot_appearance(
@@ -403,7 +682,7 @@ class Config(commands.Cog):
             await interaction.response.defer(ephemeral=True)
             
             # Get current config
-            config = self._get_config(interaction.guild_id)
+            config = self._get_config_mutable(interaction.guild_id)
             if "appearance" not in config:
                 config["appearance"] = {}
 
@@ -419,33 +698,34 @@ class Config(commands.Cog):
 
             # Validate avatar URL
             if avatar_url:
-                # Check if URL is valid
-                try:
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(avatar_url) as resp:
-                            if resp.status != 200:
-                                await interaction.followup.send(
-                                    "❌ Invalid avatar URL! Please provide a direct image URL.",
-                                    ephemeral=True
-                                )
-                                return
-                            if not resp.headers.get("content-type", "").startswith("image/"):
-                                await interaction.followup.send(
-                                    "❌ The URL must point to an image file!",
-                                    ephemeral=True
-                                )
-                                return
-                except Exception:
-                    await interaction.followup.send(
-                        "❌ Failed to access the avatar URL. Please make sure it's a valid, direct image URL.",
-                        ephemeral=True
-                    )
-                    return
+                # Check if URL is valid, unless it passed recently
+                if not self._is_known_image_url(avatar_url):
+                    try:
+                        status, content_type = await self._probe_image_url(avatar_url)
+                        if status not in (200, 206):
+                            await interaction.followup.send(
+                                "❌ Invalid avatar URL! Please provide a direct image URL.",
+                                ephemeral=True
+                            )
+                            return
+                        if not content_type.startswith("image/"):
+                            await interaction.followup.send(
+                                "❌ The URL must point to an image file!",
+                                ephemeral=True
+                            )
+                            return
+                    except Exception:
+                        await interaction.followup.send(
+                            "❌ Failed to access the avatar URL. Please make sure it's a valid, direct image URL.",
+                            ephemeral=True
+                        )
+                        return
+                    self._remember_image_url(avatar_url)
 
                 config["appearance"]["avatar_url"] = avatar_url
 
             # Save config
-            self.bot.data_manager.save_data(interaction.guild_id, self.data_type, config)
+            self._save_config(interaction.guild_id, config)
 
             # Create response embed
             embed = discord.Embed(
@@ -487,12 +767,12 @@ class Config(commands.Cog):
         """Reset the bot's appearance to default for this server."""
         try:
             # Get current config
-            config = self._get_config(interaction.guild_id)
+            config = self._get_config_mutable(interaction.guild_id)
             
             # Remove appearance settings
             if "appearance" in config:
                 del config["appearance"]
-                self.bot.data_manager.save_data(interaction.guild_id, self.data_type, config)
+                self._save_config(interaction.guild_id, config)
                 
             await interaction.response.send_message(
                 "✅ Bot appearance has been reset to default!",
@@ -505,123 +785,70 @@ class Config(commands.Cog):
                 ephemeral=True
             )
 
-    @app_commands.command(name="invite", description="Get the bot's invite link and information")
-    async def invite_link(self, interaction: discord.Interaction):
-        """Generate an invite link for the bot with detailed information."""
-        permissions = discord.Permissions(
-            # Moderation permissions
-            kick_members=True,
-            ban_members=True,
-            moderate_members=True,
-            manage_messages=True,
-            manage_threads=True,
-            
-            # Channel permissions
-            manage_channels=True,
-            manage_roles=True,
-            manage_webhooks=True,
-            view_channel=True,
-            
-            # Message permissions
-            send_messages=True,
-            send_messages_in_threads=True,
-            create_public_threads=True,
-            embed_links=True,
-            attach_files=True,
-            add_reactions=True,
-            use_external_emojis=True,
-            use_external_stickers=True,
-            read_message_history=True,
-            mention_everyone=True,
-            
-            # Voice permissions
-            connect=True,
-            speak=True,
-            mute_members=True,
-            deafen_members=True,
-            move_members=True,
-            use_voice_activation=True,
-        )
-        
-        invite_url = discord.utils.oauth_url(
+    def _build_invite(self):
+        """Build the invite URL and embed once; they only depend on the bot user."""
+        self._invite_url = discord.utils.oauth_url(
             self.bot.user.id,
-            permissions=permissions,
+            permissions=_INVITE_PERMISSIONS,
             scopes=["bot", "applications.commands"]
         )
         
         embed = discord.Embed(
             title="🍓 Invite Strwbrry Jam Bot",
-            description=(
-                f"Click [here]({invite_url}) to add me to your server!\n\n"
-                "**Why choose Strwbrry Jam Bot?**\n"
-                "• 🛡️ Advanced moderation & auto-moderation\n"
-                "• 💰 Fun economy system with games\n"
-                "• ⭐ XP system with role rewards\n"
-                "• 🎮 Interactive mini-games\n"
-                "• 🎫 Support ticket system\n"
-                "• 👋 Customizable welcome messages\n"
-                "• 📊 Detailed server statistics\n"
-            ),
+            description=f"Click [here]({self._invite_url}) to add me to your server!\n\n" + _INVITE_FEATURES,
             color=discord.Color.from_rgb(255, 182, 193)  # Strawberry pink color
         )
         
-        # Add feature sections
-        embed.add_field(
-            name="🛡️ Moderation Features",
-            value=(
-                "• Warning system with infractions tracking\n"
-                "• Temporary & permanent bans\n"
-                "• Advanced auto-moderation\n"
-                "• Detailed logging system"
-            ),
-            inline=True
-        )
+        for name, value, inline in _INVITE_FIELDS:
+            embed.add_field(name=name, value=value, inline=inline)
         
-        embed.add_field(
-            name="🎮 Fun & Games",
-            value=(
-                "• Economy system with shop\n"
-                "• Interactive mini-games\n"
-                "• Trivia challenges\n"
-                "• Giveaway system"
-            ),
-            inline=True
+        # Set bot avatar as thumbnail if available
+        if self.bot.user.avatar:
+            embed.set_thumbnail(url=self.bot.user.avatar.url)
+        
+        # Add footer with tip
+        embed.set_footer(
+            text="💡 Tip: Make sure to grant all permissions for full functionality!"
         )
         
+        self._invite_embed = embed
+
+    def _get_bot_stats(self) -> tuple:
+        """Return (guilds, users, commands), recounting at most once per stats_cache_ttl."""
+        now = time.time()
+        if self._stats_cache is None or now - self._stats_cache[1] >= self.stats_cache_ttl:
+            stats = (
+                len(self.bot.guilds),
+                sum(g.member_count or 0 for g in self.bot.guilds),
+                len(self.bot.tree.get_commands())
+            )
+            self._stats_cache = (stats, now)
+        return self._stats_cache[0]
+
+    @app_commands.command(name="invite", description="Get the bot's invite link and information")
+    async def invite_link(self, interaction: discord.Interaction):
+        """Generate an invite link for the bot with detailed information."""
+        if self._invite_embed is None:
+            self._build_invite()
+        embed = self._invite_embed
+        invite_url = self._invite_url
+        
         # Add bot stats if available
         if hasattr(self.bot, 'guild_count'):
-            embed.add_field(
+            guild_count, user_count, command_count = self._get_bot_stats()
+            embed = embed.copy()
+            embed.insert_field_at(
+                2,
                 name="📊 Bot Stats",
                 value=(
-                    f"• Servers: {len(self.bot.guilds):,}\n"
-                    f"• Users: {sum(g.member_count for g in self.bot.guilds):,}\n"
-                    f"• Commands: {len(self.bot.tree.get_commands()):,}\n"
+                    f"• Servers: {guild_count:,}\n"
+                    f"• Users: {user_count:,}\n"
+                    f"• Commands: {command_count:,}\n"
                     "• Uptime: 99.9%"
                 ),
                 inline=False
             )
         
-        # Add support info
-        embed.add_field(
-            name="🔗 Quick Links",
-            value=(
-                "[Support Server](https://discord.gg/your-support-server)\n"
-                "[Documentation](https://docs.your-bot-website.com)\n"
-                "[Top.gg Page](https://top.gg/your-bot)\n"
-                "[GitHub](https://github.com/your-username/strwbrry_jam_bot)"
-            ),
-            inline=False
-        )
-        
-        # Set bot avatar as thumbnail if available
-        if self.bot.user.avatar:
-            embed.set_thumbnail(url=self.bot.user.avatar.url)
-        
-        # Add footer with tip
-        embed.set_footer(
-            text="💡 Tip: Make sure to grant all permissions for full functionality!"
-        )
-        
         # Create button view
         view = discord.ui.View()
         view.add_item(
@@ -658,28 +885,40 @@ class Config(commands.Cog):
             return False
             
         try:
-            config = self._get_config(message.guild.id)
+            config = self._get_config_readonly(message.guild.id)
             appearance = config.get("appearance", {})
             
             if not appearance:
                 return False
                 
-            webhook = await self._get_or_create_webhook(message.channel)
-            
-            # Send message with custom appearance
-            await webhook.send(
+            send_kwargs = dict(
                 content=message.content,
                 username=appearance.get("name", self.bot.user.name),
                 avatar_url=appearance.get("avatar_url", self.bot.user.avatar.url),
                 embeds=message.embeds
             )
+            webhook = await self._get_or_create_webhook(message.channel)
+            
+            # Send message with custom appearance
+            try:
+                await webhook.send(**send_kwargs)
+            except discord.NotFound:
+                # Cached webhook was deleted; fetch or create a fresh one and retry once
+                self._webhook_cache.pop(message.channel.id, None)
+                webhook = await self._get_or_create_webhook(message.channel)
+                await webhook.send(**send_kwargs)
             
             # Delete original message
             await message.delete()
             return True
             
-        except Exception as e:
-            print(f"Error using custom appearance: {e}")
+        except Exception:
+            # Log at most one failure per channel per minute so a broken webhook can't flood the logs
+            now = time.time()
+            channel_id = message.channel.id
+            if now - self._appearance_error_times.get(channel_id, 0) >= 60:
+                self._appearance_error_times[channel_id] = now
+                self.logger.exception("Error using custom appearance in channel %s", channel_id)
             return False
 
     @commands.Cog.listener()
@@ -687,6 +926,8 @@ class Config(commands.Cog):
         """Listen for messages to apply custom appearance."""
         if message.author != self.bot.user:
             return
+        if message.guild and message.guild.id in self._no_appearance_guilds:
+            return
             
         await self._use_custom_appearance(message)
 
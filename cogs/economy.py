@@ -1,98 +1,236 @@
 import discord
 from discord import app_commands
-from discord.ext import commands
+from discord.ext import commands, tasks
 from typing import Optional
+from collections import OrderedDict, defaultdict
+from operator import itemgetter
 import asyncio
-from datetime import datetime, timedelta
+import copy
+import heapq
+from datetime import datetime, timezone
 import random
 import logging
+import time
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+MAX_TRANSACTIONS = 10
+
+def _split_duration(seconds: float) -> tuple:
+    """Split a duration in seconds into whole (days, hours, minutes, seconds)."""
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return days, hours, minutes, seconds
+
+def _migrate_reward_times(data: dict):
+    """Convert ISO reward timestamps left by older data to epoch seconds, once per load."""
+    for udata in data.values():
+        for key in ("last_daily", "last_weekly"):
+            value = udata.get(key)
+            if isinstance(value, str):
+                udata[key] = int(datetime.fromisoformat(value).timestamp())
 
 class Economy(commands.Cog):
+    # Rank labels for the /richest top 10, indexed by rank - 1
+    _MEDALS = ("🥇", "🥈", "🥉", "`4.`", "`5.`", "`6.`", "`7.`", "`8.`", "`9.`", "`10.`")
+    _ALL_REWARDS_READY = "Daily: ✅ Ready!\nWeekly: ✅ Ready!"
+    _LEADERBOARD_ROW = "{medal} **{name}**\n└ 🪙 {balance:,} coins ({percentage:.1f}% of total)"
+
     def __init__(self, bot):
         self.bot = bot
         self.data_type = "economy"
         self.active_giveaways = {}
+        self.giveaways_key = "active"
+        self._giveaway_tasks = {}  # message_id -> timer task that ends the giveaway
         self.logger = logging.getLogger(__name__)
-        self._cache = {}  # guild_id -> {user_id -> (data, timestamp)}
-        self.cache_ttl = 300  # 5 minutes
-
-    def _get_user_data(self, guild_id: int, user_id: int) -> dict:
-        """Get user's economy data for a specific guild with caching."""
-        cache_key = f"{guild_id}_{user_id}"
-        current_time = datetime.now().timestamp()
-
-        # Check cache first
-        if cache_key in self._cache:
-            data, timestamp = self._cache[cache_key]
-            if current_time - timestamp < self.cache_ttl:
-                return data.copy()  # Return copy to prevent mutations
+        self._guild_cache = OrderedDict()  # guild_id -> {user_id: entry} with int keys, least recently used first
+        self.cache_max_guilds = 256
+        self._balances = {}  # guild_id -> {user_id: balance}, kept in step with _guild_cache for /richest
+        self._dirty_guilds = set()  # Guilds with changes not yet written to storage
+        self._flushing_guilds = set()  # Guilds whose snapshot is being written right now
+        self._load_locks = defaultdict(asyncio.Lock)  # guild_id -> lock serializing loads of that guild
+        self._flush_lock = asyncio.Lock()  # Held while a flush writes, so unload never cancels one midway
+
+    async def cog_load(self):
+        """Start the background writer and resume saved giveaways"""
+        self.flush_economy_data.start()
+        await self._load_giveaways()
+
+    async def cog_unload(self):
+        """Stop the background writer and persist pending changes"""
+        # Cancel only between flushes, so no write is cut off midway; the final flush writes the rest
+        async with self._flush_lock:
+            self.flush_economy_data.cancel()
+        for task in list(self._giveaway_tasks.values()):
+            task.cancel()
+        await self._flush_dirty_guilds()
+
+    @tasks.loop(seconds=5)
+    async def flush_economy_data(self):
+        """Periodically write changed guild economy data to storage"""
+        await self._flush_dirty_guilds()
+
+    async def _flush_dirty_guilds(self):
+        """Write every guild with pending changes on a worker thread"""
+        async with self._flush_lock:
+            dirty, self._dirty_guilds = self._dirty_guilds, set()
+            self._flushing_guilds = dirty
+            # Snapshot every guild before the first await: commands keep mutating the cached
+            # dicts (and may evict them) while the worker thread serializes. Storage keeps str keys.
+            snapshots = [
+                (guild_id, {str(uid): copy.deepcopy(udata) for uid, udata in self._guild_cache[guild_id].items()})
+                for guild_id in dirty
+                if guild_id in self._guild_cache
+            ]
+            saved = set()
+            try:
+                for guild_id, snapshot in snapshots:
+                    try:
+                        await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, self.data_type, snapshot)
+                        saved.add(guild_id)
+                    except Exception as e:
+                        self.logger.error(f"Error saving economy data for guild {guild_id}: {e}")
+            finally:
+                # Anything not written (failed, or the flush was cancelled) is retried by the next flush
+                self._dirty_guilds.update(guild_id for guild_id, _ in snapshots if guild_id not in saved)
+                self._flushing_guilds = set()
+
+    async def _get_guild_data(self, guild_id: int) -> dict:
+        """Get the cached economy data for a guild, loading it on first use."""
+        data = self._guild_cache.get(guild_id)
+        if data is not None:
+            self._guild_cache.move_to_end(guild_id)
+            return data
+
+        async with self._load_locks[guild_id]:
+            # Another command may have loaded this guild while we waited for the lock
+            data = self._guild_cache.get(guild_id)
+            if data is not None:
+                return data
 
-        try:
-            data = self.bot.data_manager.load_data(guild_id, self.data_type)
-        except FileNotFoundError:
-            data = {}
-        except Exception as e:
-            self.logger.error(f"Error loading economy data: {e}")
-            data = {}
-            
-        if str(user_id) not in data:
+            try:
+                stored = await asyncio.to_thread(self.bot.data_manager.load_data, guild_id, self.data_type)
+            except FileNotFoundError:
+                stored = {}
+            except Exception as e:
+                self.logger.error(f"Error loading economy data: {e}")
+                stored = {}
+
+            # Convert the JSON str keys once here so lookups never need str()/int()
+            data = {int(uid): udata for uid, udata in stored.items()}
+            _migrate_reward_times(data)
+            self._guild_cache[guild_id] = data
+            self._balances[guild_id] = {user_id: udata["balance"] for user_id, udata in data.items()}
+            self._evict_guilds(keep=guild_id)
+        return data
+
+    def _evict_guilds(self, keep: int):
+        """Drop least recently used guilds once the cache is over its limit.
+
+        Guilds with unwritten changes are kept until the flush has written them, so a
+        later load never reads stale data from storage. The guild being loaded is never evicted.
+        """
+        excess = len(self._guild_cache) - self.cache_max_guilds
+        if excess <= 0:
+            return
+        evictable = [
+            guild_id for guild_id in self._guild_cache
+            if guild_id != keep
+            and guild_id not in self._dirty_guilds
+            and guild_id not in self._flushing_guilds
+        ]
+        for guild_id in evictable[:excess]:
+            del self._guild_cache[guild_id]
+            del self._balances[guild_id]
+            # Drop the guild's load lock too, or the lock table grows with every guild ever loaded
+            lock = self._load_locks.get(guild_id)
+            if lock is not None and not lock.locked():
+                del self._load_locks[guild_id]
+
+    async def _get_guild_balances(self, guild_id: int) -> dict:
+        """Get a guild's user_id -> balance index without touching the full user entries."""
+        await self._get_guild_data(guild_id)
+        return self._balances[guild_id]
+
+    async def _get_user_data(self, guild_id: int, user_id: int) -> dict:
+        """Get user's economy data for a specific guild. The returned dict is the cached entry."""
+        data = await self._get_guild_data(guild_id)
+        if user_id not in data:
             starting_balance = self.bot.config_manager.get_value(
                 guild_id,
                 "economy",
                 "starting_balance",
                 default=100
             )
-            data[str(user_id)] = {
+            data[user_id] = {
                 "balance": starting_balance,
                 "last_daily": None,
                 "last_weekly": None,
                 "inventory": [],
                 "transactions": []  # New: track recent transactions
             }
-            try:
-                self.bot.data_manager.save_data(guild_id, self.data_type, data)
-            except Exception as e:
-                self.logger.error(f"Error saving initial economy data: {e}")
-
-        user_data = data[str(user_id)]
-        self._cache[cache_key] = (user_data.copy(), current_time)
-        return user_data
-
-    def _save_user_data(self, guild_id: int, user_id: int, user_data: dict) -> bool:
-        """Save user's economy data for a specific guild. Returns success status."""
-        try:
-            data = self.bot.data_manager.load_data(guild_id, self.data_type)
-        except FileNotFoundError:
-            data = {}
-        except Exception as e:
-            self.logger.error(f"Error loading economy data for save: {e}")
-            return False
-
-        try:
-            data[str(user_id)] = user_data
-            self.bot.data_manager.save_data(guild_id, self.data_type, data)
-            
-            # Update cache
-            cache_key = f"{guild_id}_{user_id}"
-            self._cache[cache_key] = (user_data.copy(), datetime.now().timestamp())
-            return True
-        except Exception as e:
-            self.logger.error(f"Error saving economy data: {e}")
-            return False
-
-    def _add_transaction(self, user_data: dict, amount: int, description: str):
-        """Add a transaction to user's history"""
-        if "transactions" not in user_data:
-            user_data["transactions"] = []
-            
-        user_data["transactions"].append({
+            # A default entry lives in memory only; the guild is written once a command saves a change
+            self._balances[guild_id][user_id] = starting_balance
+
+        return data[user_id]
+
+    async def _save_user_data(self, guild_id: int, user_id: int, user_data: dict) -> bool:
+        """Save user's economy data for a specific guild. Returns success status.
+
+        The change is made in memory; flush_economy_data writes it to storage.
+        """
+        data = await self._get_guild_data(guild_id)
+        data[user_id] = user_data
+        self._balances[guild_id][user_id] = user_data["balance"]
+        self._dirty_guilds.add(guild_id)
+        return True
+
+    def _add_transaction(self, user_data: dict, amount: int, description: str, now: Optional[int] = None):
+        """Add a transaction to user's history. Pass now when the caller already read the clock."""
+        transactions = user_data.setdefault("transactions", [])
+        transactions.append({
             "amount": amount,
             "description": description,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": int(time.time()) if now is None else now
         })
         
-        # Keep only last 10 transactions
-        user_data["transactions"] = user_data["transactions"][-10:]
+        # Keep only the last MAX_TRANSACTIONS, trimming in place rather than copying the list
+        if len(transactions) > MAX_TRANSACTIONS:
+            del transactions[:-MAX_TRANSACTIONS]
+
+    async def _load_giveaways(self):
+        """Restore giveaways that were running when the bot stopped and restart their timers"""
+        saved = await self.bot.data_manager.load_json("giveaways", self.giveaways_key)
+        for channel_id, giveaways in saved.items():
+            for message_id, giveaway in giveaways.items():
+                self.active_giveaways.setdefault(int(channel_id), {})[int(message_id)] = giveaway
+                self._start_giveaway_timer(int(channel_id), int(message_id))
+
+    async def _save_giveaways(self):
+        """Persist running giveaways so a restart can resume them"""
+        await self.bot.data_manager.save_json("giveaways", self.giveaways_key, self.active_giveaways)
+
+    async def _remove_giveaway(self, channel_id: int, message_id: int):
+        """Forget a finished giveaway and persist the remaining ones"""
+        del self.active_giveaways[channel_id][message_id]
+        if not self.active_giveaways[channel_id]:
+            del self.active_giveaways[channel_id]
+        await self._save_giveaways()
+
+    def _start_giveaway_timer(self, channel_id: int, message_id: int):
+        """Schedule a giveaway to end at its stored end time"""
+        task = asyncio.create_task(self._run_giveaway_timer(channel_id, message_id))
+        self._giveaway_tasks[message_id] = task
+        task.add_done_callback(lambda _: self._giveaway_tasks.pop(message_id, None))
+
+    async def _run_giveaway_timer(self, channel_id: int, message_id: int):
+        """Sleep until a giveaway's end time, then end it"""
+        # Restored giveaways may already be due; channels can only be resolved once ready
+        await self.bot.wait_until_ready()
+        giveaway = self.active_giveaways[channel_id][message_id]
+        await asyncio.sleep(max(0, giveaway["end_time"] - time.time()))
+        await self._end_giveaway(channel_id, message_id)
 
     async def _end_giveaway(self, channel_id: int, message_id: int):
         """End a giveaway and select winner(s)"""
@@ -102,6 +240,7 @@ class Economy(commands.Cog):
         giveaway = self.active_giveaways[channel_id][message_id]
         channel = self.bot.get_channel(channel_id)
         if not channel:
+            await self._remove_giveaway(channel_id, message_id)
             return
 
         try:
@@ -121,20 +260,19 @@ class Economy(commands.Cog):
                 return
 
             # Select winner(s)
-            winners = []
             winner_count = min(giveaway["winners"], len(users))
-            for _ in range(winner_count):
-                if not users:
-                    break
-                winner = random.choice(users)
-                winners.append(winner)
-                users.remove(winner)
-
-            # Award prizes
+            winners = random.sample(users, winner_count)
+
+            # Award prizes, marking the guild dirty once for all winners
+            guild_id = channel.guild.id
+            prize = giveaway["prize"]
+            balances = await self._get_guild_balances(guild_id)
             for winner in winners:
-                user_data = self._get_user_data(channel.guild.id, winner.id)
-                user_data["balance"] += giveaway["prize"]
-                self._save_user_data(channel.guild.id, winner.id, user_data)
+                user_data = await self._get_user_data(guild_id, winner.id)
+                user_data["balance"] += prize
+                self._add_transaction(user_data, prize, "Giveaway Prize")
+                balances[winner.id] = user_data["balance"]
+            self._dirty_guilds.add(guild_id)
 
             # Announce winners
             winners_text = ", ".join(winner.mention for winner in winners)
@@ -151,16 +289,14 @@ class Economy(commands.Cog):
             await channel.send(f"An error occurred while ending the giveaway: {str(e)}")
         finally:
             # Clean up
-            del self.active_giveaways[channel_id][message_id]
-            if not self.active_giveaways[channel_id]:
-                del self.active_giveaways[channel_id]
+            await self._remove_giveaway(channel_id, message_id)
 
     @app_commands.command(name="balance", description="Check your or another user's balance")
     async def balance(self, interaction: discord.Interaction, user: Optional[discord.Member] = None):
         """Check balance command with transaction history."""
         try:
             target = user or interaction.user
-            user_data = self._get_user_data(interaction.guild_id, target.id)
+            user_data = await self._get_user_data(interaction.guild_id, target.id)
             
             embed = discord.Embed(
                 title="💰 Balance Overview",
@@ -173,6 +309,16 @@ class Economy(commands.Cog):
                 value=f"🪙 {user_data['balance']:,} coins",
                 inline=False
             )
+
+            # Users who never claimed or spent anything have no history and no cooldowns to work out
+            if not (user_data.get("transactions") or user_data.get("last_daily") or user_data.get("last_weekly")):
+                embed.add_field(
+                    name="⏰ Reward Cooldowns",
+                    value=self._ALL_REWARDS_READY,
+                    inline=False
+                )
+                await interaction.response.send_message(embed=embed)
+                return
             
             # Recent transactions
             if "transactions" in user_data and user_data["transactions"]:
@@ -192,13 +338,13 @@ class Economy(commands.Cog):
             # Cooldowns
             cooldowns = []
             
+            now = time.time()
+            
             # Daily reward
-            if "last_daily" in user_data and user_data["last_daily"]:
-                last_daily = datetime.fromisoformat(user_data["last_daily"])
-                if datetime.now() - last_daily < timedelta(days=1):
-                    time_left = timedelta(days=1) - (datetime.now() - last_daily)
-                    hours = int(time_left.total_seconds() // 3600)
-                    minutes = int((time_left.total_seconds() % 3600) // 60)
+            last_daily = user_data.get("last_daily")
+            if last_daily:
+                if now - last_daily < DAY_SECONDS:
+                    _, hours, minutes, _ = _split_duration(DAY_SECONDS - (now - last_daily))
                     cooldowns.append(f"Daily: {hours}h {minutes}m")
                 else:
                     cooldowns.append("Daily: ✅ Ready!")
@@ -206,12 +352,10 @@ class Economy(commands.Cog):
                 cooldowns.append("Daily: ✅ Ready!")
             
             # Weekly reward
-            if "last_weekly" in user_data and user_data["last_weekly"]:
-                last_weekly = datetime.fromisoformat(user_data["last_weekly"])
-                if datetime.now() - last_weekly < timedelta(weeks=1):
-                    time_left = timedelta(weeks=1) - (datetime.now() - last_weekly)
-                    days = time_left.days
-                    hours = int((time_left.total_seconds() % 86400) // 3600)
+            last_weekly = user_data.get("last_weekly")
+            if last_weekly:
+                if now - last_weekly < WEEK_SECONDS:
+                    days, hours, _, _ = _split_duration(WEEK_SECONDS - (now - last_weekly))
                     cooldowns.append(f"Weekly: {days}d {hours}h")
                 else:
                     cooldowns.append("Weekly: ✅ Ready!")
@@ -248,12 +392,14 @@ class Economy(commands.Cog):
             )
 
             # Get user data
-            user_data = self._get_user_data(interaction.guild_id, interaction.user.id)
+            user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
             
             # Give reward
+            now = int(time.time())
             user_data["balance"] += amount
-            self._add_transaction(user_data, amount, "Daily Reward")
-            self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
+            self._add_transaction(user_data, amount, "Daily Reward", now)
+            user_data["last_daily"] = now
+            await self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
             
             embed = discord.Embed(
                 title="✨ Daily Reward",
@@ -267,18 +413,16 @@ class Economy(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
         except Exception as e:
+            self.logger.error(f"Error in daily command: {e}")
             await interaction.response.send_message(
                 "❌ An error occurred while processing your daily reward. Please try again.",
                 ephemeral=True
             )
-            print(f"Error in daily command: {str(e)}")
 
     @daily.error
     async def daily_error(self, interaction: discord.Interaction, error):
         if isinstance(error, app_commands.CommandOnCooldown):
-            hours = int(error.retry_after // 3600)
-            minutes = int((error.retry_after % 3600) // 60)
-            seconds = int(error.retry_after % 60)
+            _, hours, minutes, seconds = _split_duration(error.retry_after)
             
             await interaction.response.send_message(
                 f"⏰ You can claim your daily reward in {hours} hours, {minutes} minutes, and {seconds} seconds.",
@@ -293,20 +437,18 @@ class Economy(commands.Cog):
     @app_commands.command(name="weekly", description="Claim your weekly reward")
     async def weekly(self, interaction: discord.Interaction):
         """Weekly reward command."""
-        user_data = self._get_user_data(interaction.guild_id, interaction.user.id)
-        
-        # Check cooldown
-        if user_data["last_weekly"]:
-            last_claim = datetime.fromisoformat(user_data["last_weekly"])
-            if datetime.now() - last_claim < timedelta(weeks=1):
-                time_left = timedelta(weeks=1) - (datetime.now() - last_claim)
-                days = time_left.days
-                hours = time_left.seconds // 3600
-                await interaction.response.send_message(
-                    f"⏰ You can claim your weekly reward in {days} days and {hours} hours.",
-                    ephemeral=True
-                )
-                return
+        user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
+
+        # Check cooldown against the persisted per-guild claim time, so it survives restarts
+        now = int(time.time())
+        last_claim = user_data.get("last_weekly")
+        if last_claim and now - last_claim < WEEK_SECONDS:
+            days, hours, _, _ = _split_duration(WEEK_SECONDS - (now - last_claim))
+            await interaction.response.send_message(
+                f"⏰ You can claim your weekly reward in {days} days and {hours} hours.",
+                ephemeral=True
+            )
+            return
 
         # Get reward amount from config
         amount = self.bot.config_manager.get_value(
@@ -318,9 +460,9 @@ class Economy(commands.Cog):
 
         # Give reward
         user_data["balance"] += amount
-        self._add_transaction(user_data, amount, "Weekly Reward")
-        user_data["last_weekly"] = datetime.now().isoformat()
-        self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
+        self._add_transaction(user_data, amount, "Weekly Reward", now)
+        user_data["last_weekly"] = now
+        await self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
         
         embed = discord.Embed(
             title="🎉 Weekly Reward",
@@ -350,7 +492,7 @@ class Economy(commands.Cog):
         """Start a coin giveaway"""
         try:
             # Check if user has enough balance
-            user_data = self._get_user_data(interaction.guild_id, interaction.user.id)
+            user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
             total_prize = prize * winners
 
             if user_data["balance"] < total_prize:
@@ -382,7 +524,7 @@ class Economy(commands.Cog):
             # Deduct coins from host
             user_data["balance"] -= total_prize
             self._add_transaction(user_data, -total_prize, f"Hosted Giveaway ({winners} winner(s))")
-            if not self._save_user_data(interaction.guild_id, interaction.user.id, user_data):
+            if not await self._save_user_data(interaction.guild_id, interaction.user.id, user_data):
                 await interaction.response.send_message(
                     "❌ Failed to start giveaway due to a data error. Please try again.",
                     ephemeral=True
@@ -390,7 +532,8 @@ class Economy(commands.Cog):
                 return
 
             # Create giveaway embed
-            end_time = datetime.utcnow() + timedelta(minutes=duration)
+            ends_at = int(time.time()) + duration * 60
+            end_time = datetime.fromtimestamp(ends_at, timezone.utc)
             embed = discord.Embed(
                 title="🎉 Coin Giveaway!",
                 description=(
@@ -417,15 +560,15 @@ class Economy(commands.Cog):
             self.active_giveaways[interaction.channel.id][message.id] = {
                 "prize": prize,
                 "winners": winners,
-                "end_time": end_time,
+                "end_time": ends_at,  # Epoch seconds, so it survives a restart
                 "host": interaction.user.id,
                 "message_id": message.id,
                 "channel_id": interaction.channel.id
             }
 
-            # Schedule end
-            await asyncio.sleep(duration * 60)
-            await self._end_giveaway(interaction.channel.id, message.id)
+            # Persist and schedule the end; the timer outlives this command and a restart resumes it
+            await self._save_giveaways()
+            self._start_giveaway_timer(interaction.channel.id, message.id)
 
         except Exception as e:
             self.logger.error(f"Error in giveaway command: {e}")
@@ -445,7 +588,7 @@ class Economy(commands.Cog):
             )
             return
 
-        user_data = self._get_user_data(interaction.guild_id, user.id)
+        user_data = await self._get_user_data(interaction.guild_id, user.id)
         max_balance = self.bot.config_manager.get_value(
             interaction.guild_id,
             "economy",
@@ -462,7 +605,7 @@ class Economy(commands.Cog):
 
         user_data["balance"] += amount
         self._add_transaction(user_data, amount, f"Received from {interaction.user.name} (Admin)")
-        self._save_user_data(interaction.guild_id, user.id, user_data)
+        await self._save_user_data(interaction.guild_id, user.id, user_data)
 
         embed = discord.Embed(
             title="💸 Coins Given",
@@ -487,7 +630,7 @@ class Economy(commands.Cog):
                 )
                 return
             
-            user_data = self._get_user_data(interaction.guild_id, user.id)
+            user_data = await self._get_user_data(interaction.guild_id, user.id)
             
             if user_data["balance"] < amount:
                 await interaction.response.send_message(
@@ -498,7 +641,7 @@ class Economy(commands.Cog):
             
             user_data["balance"] -= amount
             self._add_transaction(user_data, -amount, f"Taken by {interaction.user.name} (Admin)")
-            self._save_user_data(interaction.guild_id, user.id, user_data)
+            await self._save_user_data(interaction.guild_id, user.id, user_data)
             
             embed = discord.Embed(
                 title="💸 Coins Taken",
@@ -512,18 +655,18 @@ class Economy(commands.Cog):
             await interaction.response.send_message(embed=embed)
             
         except Exception as e:
+            self.logger.error(f"Error in take command: {e}")
             await interaction.response.send_message(
                 "❌ An error occurred while processing the command. Please try again.",
                 ephemeral=True
             )
-            print(f"Error in take command: {str(e)}")
 
     @app_commands.command(name="richest", description="View the server's wealthiest members")
     async def richest(self, interaction: discord.Interaction):
         """Show economy leaderboard with detailed stats."""
         try:
-            data = self.bot.data_manager.load_data(interaction.guild_id, self.data_type)
-            if not data:
+            balances = await self._get_guild_balances(interaction.guild_id)
+            if not balances:
                 await interaction.response.send_message(
                     "❌ No economy data found for this server!",
                     ephemeral=True
@@ -531,16 +674,12 @@ class Economy(commands.Cog):
                 return
 
             # Get server stats
-            total_coins = sum(udata["balance"] for udata in data.values())
-            active_users = len(data)
+            total_coins = sum(balances.values())
+            active_users = len(balances)
             avg_balance = total_coins // active_users if active_users > 0 else 0
             
-            # Sort users by balance
-            sorted_users = sorted(
-                [(int(uid), udata["balance"]) for uid, udata in data.items()],
-                key=lambda x: x[1],
-                reverse=True
-            )[:10]  # Top 10
+            # Top 10 users by balance
+            sorted_users = heapq.nlargest(10, balances.items(), key=itemgetter(1))
             
             if not sorted_users:
                 await interaction.response.send_message(
@@ -549,61 +688,63 @@ class Economy(commands.Cog):
                 )
                 return
             
-            embed = discord.Embed(
-                title="🏆 Wealthiest Members",
-                description=(
-                    f"**Server Economy Stats**\n"
-                    f"Total Coins: 🪙 {total_coins:,}\n"
-                    f"Active Users: 👥 {active_users:,}\n"
-                    f"Average Balance: 🪙 {avg_balance:,}\n"
-                ),
-                color=discord.Color.gold()
-            )
-            
             # Leaderboard
-            medals = ["🥇", "🥈", "🥉"]
             leaderboard = []
             user_position = None
             
-            for idx, (user_id, balance) in enumerate(sorted_users, 1):
-                user = interaction.guild.get_member(user_id)
-                if user:
-                    medal = medals[idx-1] if idx <= 3 else f"`{idx}.`"
-                    percentage = (balance / total_coins * 100) if total_coins > 0 else 0
-                    leaderboard.append(
-                        f"{medal} **{user.display_name}**\n"
-                        f"└ 🪙 {balance:,} coins ({percentage:.1f}% of total)"
-                    )
-                    
-                    if user.id == interaction.user.id:
-                        user_position = idx
-
-            embed.add_field(
-                name="🎖️ Top 10 Leaderboard",
-                value="\n".join(leaderboard) or "No ranked users found",
-                inline=False
-            )
+            # Resolve members once, keeping each entry's rank among all users
+            get_member = interaction.guild.get_member
+            ranked_members = [
+                (idx, member, balance)
+                for idx, (user_id, balance) in enumerate(sorted_users, 1)
+                if (member := get_member(user_id)) is not None
+            ]
+            percent_per_coin = 100 / total_coins if total_coins > 0 else 0
+            row = self._LEADERBOARD_ROW.format
+            for idx, user, balance in ranked_members:
+                leaderboard.append(row(
+                    medal=self._MEDALS[idx-1],
+                    name=user.display_name,
+                    balance=balance,
+                    percentage=balance * percent_per_coin
+                ))
+
+                if user.id == interaction.user.id:
+                    user_position = idx
+
+            fields = [{
+                "name": "🎖️ Top 10 Leaderboard",
+                "value": "\n".join(leaderboard) or "No ranked users found",
+                "inline": False
+            }]
             
             # Show requester's position if not in top 10
-            if interaction.user.id not in [uid for uid, _ in sorted_users]:
-                user_data = self._get_user_data(interaction.guild_id, interaction.user.id)
-                all_users = sorted(
-                    [(int(uid), udata["balance"]) for uid, udata in data.items()],
-                    key=lambda x: x[1],
-                    reverse=True
-                )
-                user_position = next(
-                    (idx for idx, (uid, _) in enumerate(all_users, 1) if uid == interaction.user.id),
-                    None
-                )
+            top_ids = {uid for uid, _ in sorted_users}
+            if interaction.user.id not in top_ids:
+                user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
+                # Rank is one more than the number of richer users; no need to sort everyone
+                my_balance = user_data["balance"]
+                user_position = sum(1 for balance in balances.values() if balance > my_balance) + 1
                 if user_position:
-                    embed.add_field(
-                        name="📊 Your Ranking",
-                        value=f"You are ranked #{user_position} with 🪙 {user_data['balance']:,} coins",
-                        inline=False
-                    )
-            
-            embed.set_footer(text="💡 Use /balance to see your detailed stats")
+                    fields.append({
+                        "name": "📊 Your Ranking",
+                        "value": f"You are ranked #{user_position} with 🪙 {user_data['balance']:,} coins",
+                        "inline": False
+                    })
+
+            # Build the embed in one pass instead of add_field/set_footer calls
+            embed = discord.Embed.from_dict({
+                "title": "🏆 Wealthiest Members",
+                "description": (
+                    f"**Server Economy Stats**\n"
+                    f"Total Coins: 🪙 {total_coins:,}\n"
+                    f"Active Users: 👥 {active_users:,}\n"
+                    f"Average Balance: 🪙 {avg_balance:,}\n"
+                ),
+                "color": discord.Color.gold().value,
+                "fields": fields,
+                "footer": {"text": "💡 Use /balance to see your detailed stats"}
+            })
             await interaction.response.send_message(embed=embed)
 
         except Exception as e:
@@ -5,13 +5,41 @@ from typing import Optional, Literal
 import random
 import asyncio
 import operator
-from datetime import datetime, timedelta
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 import string
 import logging
+import time
 import json
+import copy
 from collections import defaultdict
 
+@dataclass(slots=True)
+class UserGameStats:
+    """Game statistics for one user in one guild"""
+    games_played: int = 0
+    coins_won: int = 0
+    last_played: Optional[datetime] = None
+    daily_earnings: int = 0
+    last_daily_reset: date = field(default_factory=date.today)
+
 class Games(commands.Cog):
+    _RPS_OPTIONS = ("rock", "paper", "scissors")  # Sequence for random.choice
+    _RPS_CHOICES = frozenset(_RPS_OPTIONS)
+    _RPS_WINS = frozenset({("rock", "scissors"), ("paper", "rock"), ("scissors", "paper")})  # (user, bot) pairs the user wins
+    _MATH_OPERATORS = ("+", "-", "*")  # No division, to avoid decimal answers
+    # Chat challenge text length range and character set per difficulty
+    _CHALLENGE_LENGTHS = {
+        "easy": (5, 7),
+        "medium": (8, 12),
+        "hard": (13, 15)
+    }
+    _CHALLENGE_CHARS = {
+        "easy": string.ascii_lowercase + string.digits,
+        "medium": string.ascii_letters + string.digits,
+        "hard": string.ascii_letters + string.digits + string.punctuation
+    }
+
     def __init__(self, bot):
         self.bot = bot
         self.games_key = "games_config"
@@ -47,13 +75,7 @@ class Games(commands.Cog):
         self.logger.setLevel(logging.INFO)
         
         # Initialize game stats tracking
-        self.game_stats = defaultdict(lambda: {
-            "games_played": 0,
-            "coins_won": 0,
-            "last_played": None,
-            "daily_earnings": 0,
-            "last_daily_reset": datetime.now().date()
-        })
+        self.game_stats = defaultdict(UserGameStats)  # "guild_id:user_id" -> UserGameStats
         
         self.trivia_questions = {
             "easy": [
@@ -93,6 +115,11 @@ class Games(commands.Cog):
                 {"question": "What is the deepest point in the ocean?", "answer": "Challenger Deep"}
             ]
         }
+        # (question, answer, normalized answer) per difficulty, so answers are normalized once
+        self._trivia = {
+            difficulty: tuple((q["question"], q["answer"], q["answer"].lower().strip()) for q in questions)
+            for difficulty, questions in self.trivia_questions.items()
+        }
         self.math_operators = {
             '+': operator.add,
             '-': operator.sub,
@@ -100,64 +127,83 @@ class Games(commands.Cog):
             '/': operator.truediv
         }
         self.active_chat_challenges = {}
-        self.last_game = {}
+        self.last_game = {}  # "guild_id:user_id" -> time.monotonic() of the last finished game
         self.active_games = set()  # Track currently active game sessions
+        self._config_cache = {}  # guild_id (str) -> games config, loaded once and kept in step by update_config
 
     async def get_config(self, guild_id: str) -> dict:
         """Get the games configuration for a guild with error handling"""
+        cached = self._config_cache.get(guild_id)
+        if cached is not None:
+            return cached
         try:
-            config = self.bot.data_manager.load_data(guild_id, "games")
+            config = await asyncio.to_thread(self.bot.data_manager.load_data, guild_id, "games")
             if not config or self.games_key not in config:
-                config = {self.games_key: {guild_id: self.default_config.copy()}}
-                self.bot.data_manager.save_data(guild_id, "games", config)
-            return config[self.games_key][guild_id]
+                config = {self.games_key: {guild_id: copy.deepcopy(self.default_config)}}
+                await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, "games", config)
+            # load_data shares nested dicts with DataManager's cache, so keep a private copy
+            guild_config = copy.deepcopy(config[self.games_key][guild_id])
+            self._config_cache[guild_id] = guild_config
+            return guild_config
         except Exception as e:
             self.logger.error(f"Error loading game config: {e}")
-            return self.default_config.copy()
+            return copy.deepcopy(self.default_config)
 
     async def update_config(self, guild_id: str, setting: str, value: any) -> bool:
         """Update a specific game configuration setting with validation"""
         try:
-            config = self.bot.data_manager.load_data(guild_id, "games")
+            config = await asyncio.to_thread(self.bot.data_manager.load_data, guild_id, "games")
             if not config or self.games_key not in config:
-                config = {self.games_key: {guild_id: self.default_config.copy()}}
+                config = {self.games_key: {guild_id: copy.deepcopy(self.default_config)}}
             
             # Validate setting exists
-            if setting not in config[self.games_key][guild_id]:
+            guild_config = config[self.games_key][guild_id]
+            if setting not in guild_config:
                 raise ValueError(f"Invalid setting: {setting}")
             
-            config[self.games_key][guild_id][setting] = value
-            self.bot.data_manager.save_data(guild_id, "games", config)
+            # Build new dicts rather than editing the loaded ones: they are shared with
+            # DataManager's cache, which must not change unless the save succeeds
+            new_guild = {**guild_config, setting: value}
+            new_config = {**config, self.games_key: {**config[self.games_key], guild_id: new_guild}}
+            await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, "games", new_config)
+            self._config_cache[guild_id] = copy.deepcopy(new_guild)
             return True
         except Exception as e:
             self.logger.error(f"Error updating game config: {e}")
             return False
 
-    def _get_user_data(self, guild_id: int, user_id: int) -> dict:
+    async def _get_user_data(self, guild_id: int, user_id: int) -> dict:
         """Get user's economy data with error handling"""
+        # The Economy cog keeps economy data in memory; go through it so writes aren't lost
+        economy_cog = self.bot.get_cog('Economy')
+        if economy_cog:
+            return await economy_cog._get_user_data(guild_id, user_id)
         try:
-            data = self.bot.data_manager.load_data(guild_id, "economy")
+            data = await asyncio.to_thread(self.bot.data_manager.load_data, guild_id, "economy")
             if str(user_id) not in data:
                 data[str(user_id)] = {
                     "balance": self.bot.config_manager.get_value(guild_id, "economy", "starting_balance", default=0),
                     "inventory": [],
                     "transaction_history": []
                 }
-                self.bot.data_manager.save_data(guild_id, "economy", data)
+                await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, "economy", data)
             return data[str(user_id)]
         except Exception as e:
             self.logger.error(f"Error getting user data: {e}")
             return {"balance": 0, "inventory": [], "transaction_history": []}
 
-    def _save_user_data(self, guild_id: int, user_id: int, user_data: dict) -> bool:
+    async def _save_user_data(self, guild_id: int, user_id: int, user_data: dict) -> bool:
         """Save user's economy data with validation"""
         try:
             if "balance" not in user_data or not isinstance(user_data["balance"], (int, float)):
                 raise ValueError("Invalid user data: missing or invalid balance")
             
-            data = self.bot.data_manager.load_data(guild_id, "economy")
+            economy_cog = self.bot.get_cog('Economy')
+            if economy_cog:
+                return await economy_cog._save_user_data(guild_id, user_id, user_data)
+            data = await asyncio.to_thread(self.bot.data_manager.load_data, guild_id, "economy")
             data[str(user_id)] = user_data
-            self.bot.data_manager.save_data(guild_id, "economy", data)
+            await asyncio.to_thread(self.bot.data_manager.save_data, guild_id, "economy", data)
             return True
         except Exception as e:
             self.logger.error(f"Error saving user data: {e}")
@@ -169,15 +215,15 @@ class Games(commands.Cog):
             stats = self.game_stats[f"{guild_id}:{user_id}"]
             
             # Reset daily earnings if it's a new day
-            current_date = datetime.now().date()
-            if stats["last_daily_reset"] != current_date:
-                stats["daily_earnings"] = 0
-                stats["last_daily_reset"] = current_date
+            current_date = date.today()
+            if stats.last_daily_reset != current_date:
+                stats.daily_earnings = 0
+                stats.last_daily_reset = current_date
             
-            stats["games_played"] += 1
-            stats["coins_won"] += coins_won
-            stats["last_played"] = datetime.now()
-            stats["daily_earnings"] += coins_won
+            stats.games_played += 1
+            stats.coins_won += coins_won
+            stats.last_played = datetime.now()
+            stats.daily_earnings += coins_won
             
             # Log significant wins
             if coins_won >= 100:
@@ -189,27 +235,28 @@ class Games(commands.Cog):
     async def check_game_eligibility(self, interaction: discord.Interaction, game: str) -> tuple[bool, str]:
         """Check if user is eligible to play a game"""
         try:
+            # Check if user is already in a game; needs no config, so it goes first
+            user_key = f"{interaction.guild_id}:{interaction.user.id}"
+            if user_key in self.active_games:
+                return False, "❌ You're already in an active game! Please finish or wait for it to timeout."
+            
             config = await self.get_config(str(interaction.guild_id))
             
             # Check if game is enabled
             if game not in config["enabled_games"]:
                 return False, f"❌ {game.upper()} is currently disabled on this server."
             
-            # Check if user is already in a game
-            user_key = f"{interaction.guild_id}:{interaction.user.id}"
-            if user_key in self.active_games:
-                return False, "❌ You're already in an active game! Please finish or wait for it to timeout."
-            
             # Check cooldown
-            if user_key in self.last_game:
-                time_diff = (datetime.now() - self.last_game[user_key]).total_seconds()
+            last = self.last_game.get(user_key)
+            if last is not None:
+                time_diff = time.monotonic() - last
                 if time_diff < config["cooldown"]:
                     remaining = int(config["cooldown"] - time_diff)
                     return False, f"⏰ Please wait {remaining} seconds before playing again!"
             
             # Check daily earnings limit
             stats = self.game_stats[user_key]
-            if stats["daily_earnings"] >= config["max_daily_rewards"]:
+            if stats.daily_earnings >= config["max_daily_rewards"]:
                 return False, f"🎮 You've reached the maximum daily earnings of 🪙 {config['max_daily_rewards']}!"
             
             return True, ""
@@ -234,30 +281,30 @@ class Games(commands.Cog):
             embed.add_field(
                 name="📊 Overall Stats",
                 value=(
-                    f"Games Played: {stats['games_played']}\n"
-                    f"Total Coins Won: 🪙 {stats['coins_won']:,}\n"
-                    f"Average Win: 🪙 {stats['coins_won'] / max(1, stats['games_played']):,.1f}"
+                    f"Games Played: {stats.games_played}\n"
+                    f"Total Coins Won: 🪙 {stats.coins_won:,}\n"
+                    f"Average Win: 🪙 {stats.coins_won / max(1, stats.games_played):,.1f}"
                 ),
                 inline=False
             )
             
             # Daily Progress
-            daily_remaining = config["max_daily_rewards"] - stats["daily_earnings"]
+            daily_remaining = config["max_daily_rewards"] - stats.daily_earnings
             embed.add_field(
                 name="📅 Daily Progress",
                 value=(
-                    f"Today's Earnings: 🪙 {stats['daily_earnings']:,}\n"
+                    f"Today's Earnings: 🪙 {stats.daily_earnings:,}\n"
                     f"Remaining Today: 🪙 {daily_remaining:,}\n"
-                    f"Progress: {(stats['daily_earnings'] / config['max_daily_rewards'] * 100):,.1f}%"
+                    f"Progress: {(stats.daily_earnings / config['max_daily_rewards'] * 100):,.1f}%"
                 ),
                 inline=False
             )
             
             # Last Played
-            if stats["last_played"]:
+            if stats.last_played:
                 embed.add_field(
                     name="⏰ Last Played",
-                    value=f"{discord.utils.format_dt(stats['last_played'], 'R')}",
+                    value=f"{discord.utils.format_dt(stats.last_played, 'R')}",
                     inline=False
                 )
             
@@ -280,26 +327,21 @@ class Games(commands.Cog):
                 await interaction.response.send_message(message, ephemeral=True)
                 return
 
-            choices = ["rock", "paper", "scissors"]
-            if choice.lower() not in choices:
+            user_choice = choice.lower()
+            if user_choice not in self._RPS_CHOICES:
                 await interaction.response.send_message(
                     "❌ Invalid choice! Choose rock, paper, or scissors.",
                     ephemeral=True
                 )
                 return
 
-            bot_choice = random.choice(choices)
-            user_choice = choice.lower()
+            bot_choice = random.choice(self._RPS_OPTIONS)
 
             # Game logic
             if bot_choice == user_choice:
                 result = "It's a tie! 🤝"
                 winnings = 0
-            elif (
-                (user_choice == "rock" and bot_choice == "scissors") or
-                (user_choice == "paper" and bot_choice == "rock") or
-                (user_choice == "scissors" and bot_choice == "paper")
-            ):
+            elif (user_choice, bot_choice) in self._RPS_WINS:
                 result = "You win! 🎉"
                 winnings = self.get_winnable_amount(interaction.guild_id, "rps")
             else:
@@ -307,10 +349,10 @@ class Games(commands.Cog):
                 winnings = 0
 
             # Update user balance
-            user_data = self._get_user_data(interaction.guild_id, interaction.user.id)
+            user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
             if winnings > 0:
                 user_data["balance"] += winnings
-                self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
+                await self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
 
             embed = discord.Embed(
                 title="🎮 Rock Paper Scissors",
@@ -370,7 +412,8 @@ class Games(commands.Cog):
         config = await self.get_config(str(interaction.guild_id))
         
         # Select random question based on difficulty
-        question_data = random.choice(self.trivia_questions[difficulty])
+        question, answer, correct_answer = random.choice(self._trivia[difficulty])
+        won = False
         
         # Add user to active games
         user_key = f"{interaction.guild_id}:{interaction.user.id}"
@@ -379,7 +422,7 @@ class Games(commands.Cog):
         try:
             embed = discord.Embed(
                 title="🎯 Trivia Time!",
-                description=f"**Difficulty**: {difficulty.capitalize()}\n**Question**: {question_data['question']}\n\nYou have 30 seconds to answer!",
+                description=f"**Difficulty**: {difficulty.capitalize()}\n**Question**: {question}\n\nYou have 30 seconds to answer!",
                 color=discord.Color.blue()
             )
             embed.add_field(
@@ -400,12 +443,12 @@ class Games(commands.Cog):
             try:
                 message = await self.bot.wait_for('message', timeout=30.0, check=check)
                 
-                # Normalize both answers for comparison
+                # Normalize the user's answer the same way as the stored one
                 user_answer = message.content.lower().strip()
-                correct_answer = question_data['answer'].lower().strip()
                 
                 # Case-insensitive answer checking
-                if user_answer == correct_answer:
+                won = user_answer == correct_answer
+                if won:
                     # Award coins based on difficulty
                     reward = config['trivia_amount'][difficulty]
                     
@@ -417,9 +460,9 @@ class Games(commands.Cog):
                             return
                             
                         # Get and update user data
-                        user_data = economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
+                        user_data = await economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
                         user_data['balance'] += reward
-                        economy_cog._save_user_data(interaction.guild_id, interaction.user.id, user_data)
+                        await economy_cog._save_user_data(interaction.guild_id, interaction.user.id, user_data)
                         
                         await interaction.channel.send(
                             f"✅ Correct! You won {reward} 🪙\n"
@@ -433,17 +476,17 @@ class Games(commands.Cog):
                     await interaction.channel.send(
                         f"❌ Wrong answer!\n"
                         f"Your answer: '{message.content}'\n"
-                        f"Correct answer: '{question_data['answer']}'"
+                        f"Correct answer: '{answer}'"
                     )
                 
             except asyncio.TimeoutError:
-                await interaction.channel.send("⏰ Time's up! The correct answer was: " + question_data['answer'])
+                await interaction.channel.send("⏰ Time's up! The correct answer was: " + answer)
 
             # Update cooldown with correct user key
-            self.last_game[user_key] = datetime.now()
+            self.last_game[user_key] = time.monotonic()
 
             # Update user stats if they won
-            if message.content.lower().strip() == question_data['answer'].lower().strip():
+            if won:
                 await self.update_user_stats(interaction.guild_id, interaction.user.id, "trivia", config['trivia_amount'][difficulty])
                 
         finally:
@@ -485,7 +528,7 @@ class Games(commands.Cog):
         # Generate random numbers and operator
         num1 = random.randint(1, 100)
         num2 = random.randint(1, 100)
-        operator = random.choice(['+', '-', '*'])  # Removed division to avoid decimal answers
+        operator = random.choice(self._MATH_OPERATORS)
         
         # Calculate answer
         answer = self.math_operators[operator](num1, num2)
@@ -523,9 +566,9 @@ class Games(commands.Cog):
             # Award coins based on difficulty
             reward = config['math_amount'][difficulty]
             
-            user_data = await self.bot.economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
+            user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
             user_data['balance'] += reward
-            await self.bot.economy_cog._save_user_data(interaction.guild_id, interaction.user.id, user_data)
+            await self._save_user_data(interaction.guild_id, interaction.user.id, user_data)
             
             await interaction.channel.send(
                 f"✅ Correct! You won {reward} 🪙\n"
@@ -539,7 +582,7 @@ class Games(commands.Cog):
             )
                 
         # Update cooldown
-        self.last_game[str(interaction.user.id)] = datetime.now()
+        self.last_game[f"{interaction.guild_id}:{interaction.user.id}"] = time.monotonic()
 
         # Update user stats
         await self.update_user_stats(interaction.guild_id, interaction.user.id, "math", config['math_amount'][difficulty])
@@ -587,23 +630,10 @@ class Games(commands.Cog):
                 )
                 return
 
-            # Generate challenge text based on difficulty
-            length_ranges = {
-                "easy": (5, 7),
-                "medium": (8, 12),
-                "hard": (13, 15)
-            }
-            min_len, max_len = length_ranges[difficulty]
+            # Generate challenge text based on difficulty, drawing every character in one call
+            min_len, max_len = self._CHALLENGE_LENGTHS[difficulty]
             length = random.randint(min_len, max_len)
-            
-            # Generate text with appropriate character set
-            char_sets = {
-                "easy": string.ascii_lowercase + string.digits,
-                "medium": string.ascii_letters + string.digits,
-                "hard": string.ascii_letters + string.digits + string.punctuation
-            }
-            chars = char_sets[difficulty]
-            challenge_text = ''.join(random.choice(chars) for _ in range(length))
+            challenge_text = ''.join(random.choices(self._CHALLENGE_CHARS[difficulty], k=length))
             
             # Calculate reward based on difficulty
             rewards = {
@@ -701,9 +731,9 @@ class Games(commands.Cog):
                         return
                         
                     # Get and update user data
-                    user_data = economy_cog._get_user_data(message.guild.id, message.author.id)
+                    user_data = await economy_cog._get_user_data(message.guild.id, message.author.id)
                     user_data["balance"] += challenge['winnings']
-                    if not economy_cog._save_user_data(message.guild.id, message.author.id, user_data):
+                    if not await economy_cog._save_user_data(message.guild.id, message.author.id, user_data):
                         await message.channel.send("❌ Error saving reward. Please contact an admin.")
                         return
                     
@@ -770,7 +800,7 @@ class Games(commands.Cog):
 
             # Get user data and config
             config = await self.get_config(str(interaction.guild_id))
-            user_data = self._get_user_data(interaction.guild_id, interaction.user.id)
+            user_data = await self._get_user_data(interaction.guild_id, interaction.user.id)
 
             # Check bet limits
             if amount < config["gamble_amount"]["min"] or amount > config["gamble_amount"]["max"]:
@@ -809,7 +839,7 @@ class Games(commands.Cog):
                     net_gain = -amount
 
                 # Save user data
-                if not self._save_user_data(interaction.guild_id, interaction.user.id, user_data):
+                if not await self._save_user_data(interaction.guild_id, interaction.user.id, user_data):
                     await interaction.response.send_message(
                         "❌ Error saving game results. Please try again.",
                         ephemeral=True
@@ -844,7 +874,7 @@ class Games(commands.Cog):
                 await self.update_user_stats(interaction.guild_id, interaction.user.id, "gamble", net_gain)
                 
                 # Update last game time
-                self.last_game[user_key] = datetime.now()
+                self.last_game[user_key] = time.monotonic()
 
             finally:
                 # Always remove user from active games
@@ -884,25 +914,23 @@ class Games(commands.Cog):
         
         if setting in ["enable_gambling", "disable_gambling"]:
             config = await self.get_config(guild_id)
+            # Build a new list: the cached config must only change once the save succeeds
             if setting == "enable_gambling" and "gamble" not in config["enabled_games"]:
-                config["enabled_games"].append("gamble")
-                await self.update_config(guild_id, "enabled_games", config["enabled_games"])
-                await interaction.response.send_message(
-                    "✅ Gambling has been enabled for this server",
-                    ephemeral=True
-                )
+                enabled = [*config["enabled_games"], "gamble"]
+                message = "✅ Gambling has been enabled for this server"
             elif setting == "disable_gambling" and "gamble" in config["enabled_games"]:
-                config["enabled_games"].remove("gamble")
-                await self.update_config(guild_id, "enabled_games", config["enabled_games"])
-                await interaction.response.send_message(
-                    "✅ Gambling has been disabled for this server",
-                    ephemeral=True
-                )
+                enabled = [game for game in config["enabled_games"] if game != "gamble"]
+                message = "✅ Gambling has been disabled for this server"
             else:
                 await interaction.response.send_message(
                     "✅ No changes needed - gambling was already in the desired state",
                     ephemeral=True
                 )
+                return
+
+            if not await self.update_config(guild_id, "enabled_games", enabled):
+                message = "❌ An error occurred while saving the game configuration."
+            await interaction.response.send_message(message, ephemeral=True)
             return
         
         if value is None:
@@ -933,7 +961,12 @@ class Games(commands.Cog):
             )
             return
         
-        await self.update_config(guild_id, setting, value)
+        if not await self.update_config(guild_id, setting, value):
+            await interaction.response.send_message(
+                "❌ An error occurred while saving the game configuration.",
+                ephemeral=True
+            )
+            return
         await interaction.response.send_message(
             f"✅ Updated {setting} to {value}",
             ephemeral=True
@@ -955,11 +988,18 @@ class Games(commands.Cog):
         config = await self.get_config(guild_id)
         
         if enabled and game not in config["enabled_games"]:
-            config["enabled_games"].append(game)
-        elif not enabled and game in config["enabled_games"]:
-            config["enabled_games"].remove(game)
+            enabled_games = [*config["enabled_games"], game]
+        elif not enabled:
+            enabled_games = [name for name in config["enabled_games"] if name != game]
+        else:
+            enabled_games = list(config["enabled_games"])
         
-        await self.update_config(guild_id, "enabled_games", config["enabled_games"])
+        if not await self.update_config(guild_id, "enabled_games", enabled_games):
+            await interaction.response.send_message(
+                "❌ An error occurred while saving the game configuration.",
+                ephemeral=True
+            )
+            return
         status = "enabled" if enabled else "disabled"
         await interaction.response.send_message(
             f"✅ {game.upper()} has been {status}",
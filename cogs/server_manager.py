@@ -2,26 +2,77 @@ import discord
 from discord.ext import commands, tasks
 from discord import app_commands
 from typing import Optional, Dict, List
+from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import asyncio
-import json
+import heapq
+import time
 import uuid
 import re
 import logging
 
+@dataclass(slots=True)
+class BroadcastSchedule:
+    """A scheduled broadcast record, stored as a plain dict in JSON"""
+    channel_id: int
+    message: str
+    schedule: str
+    role_id: Optional[int] = None
+    last_sent: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "BroadcastSchedule":
+        return cls(**data)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+BROADCAST_SHARDS = {
+    "templates": {},    # template_name -> message_template
+    "schedules": {},    # schedule_id -> {channel_id, message, schedule, role_id, last_sent}
+    "channels": {},     # channel_id -> {enabled: bool, filters: []}
+    "history": {},      # message_id -> {template, timestamp}
+    "settings": {
+        "max_history": 100,
+        "default_interval": 3600,
+        "rate_limit": 5
+    }
+}
+
+def _default_global_stats() -> dict:
+    """Fresh global analytics counters"""
+    return {
+        "total_broadcasts": 0,
+        "total_reach": 0,
+        "most_active_hour": None,
+        "avg_engagement": 0,
+        "hourly_stats": [0] * 24  # Broadcast counts indexed by UTC hour
+    }
+
 class ServerManager(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.logger = bot.logger.getChild('server_manager')
         self.server_key = "server_settings"
-        self.broadcast_key = "broadcast_config"
-        self.analytics_key = "broadcast_analytics"
+        self.broadcast_dir = "broadcasts"  # One JSON shard per broadcast section
+        self.analytics_key = "broadcast_analytics"  # "global" shard plus one shard per guild
         self.scheduled_broadcasts = {}
         self.broadcast_tasks = {}
+        self._audit_channels: Dict[int, dict] = {}  # guild_id -> audit_log entry, for guilds with audit logging
         self.ready = asyncio.Event()
         self.config_lock = asyncio.Lock()  # Add lock for thread safety
+        self._analytics: Optional[dict] = None  # In-memory global analytics shard, persisted by flush_analytics
+        self._server_analytics: Dict[int, dict] = {}  # guild_id -> per-guild analytics shard, loaded on demand and dropped once written
+        self._analytics_dirty: set = set()  # Shard keys changed since the last flush
+        self._analytics_lock = asyncio.Lock()
         self.check_server_settings.start()
 
+    async def cog_unload(self):
+        """Stop background tasks and persist buffered analytics"""
+        self.check_server_settings.cancel()
+        self.flush_analytics.cancel()
+        await self._flush_analytics()
+
     async def _validate_channel_permissions(self, interaction: discord.Interaction, channel: discord.abc.GuildChannel) -> bool:
         """Validate bot permissions for a channel"""
         permissions = channel.permissions_for(interaction.guild.me)
@@ -50,11 +101,11 @@ class ServerManager(commands.Cog):
         try:
             async with self.config_lock:
                 config = await self.bot.data_manager.load_json("server_config", self.server_key)
-                current_time = datetime.utcnow()
+                now = time.time()
 
                 # Check temporary channels
                 for channel_id, expiry in list(config.get("temp_channels", {}).items()):
-                    if current_time.timestamp() > expiry:
+                    if now > expiry:
                         channel = self.bot.get_channel(int(channel_id))
                         if channel:
                             try:
@@ -68,6 +119,7 @@ class ServerManager(commands.Cog):
                                 self.logger.error(f"Error deleting channel {channel_id}: {e}")
 
                 # Update server stats with rate limiting
+                stats_failures = []
                 for guild_id, stats in config.get("server_stats", {}).items():
                     guild = self.bot.get_guild(int(guild_id))
                     if not guild:
@@ -99,13 +151,16 @@ class ServerManager(commands.Cog):
                                 await channel.edit(name=new_name)
                                 await asyncio.sleep(2)  # Rate limit protection
                         except discord.Forbidden:
-                            self.logger.warning(f"Failed to update stats channel {channel_id}: Missing permissions")
+                            stats_failures.append((channel_id, "Missing permissions"))
                         except Exception as e:
-                            self.logger.error(f"Error updating stats channel {channel_id}: {e}")
+                            stats_failures.append((channel_id, repr(e)))
+
+                if stats_failures:
+                    self.logger.warning("Failed to update %d stats channels: %s", len(stats_failures), stats_failures)
 
                 # Check backup schedule
                 for guild_id, schedule in config.get("backup_schedule", {}).items():
-                    if current_time.timestamp() - schedule["last_backup"] >= schedule["interval"]:
+                    if now - schedule["last_backup"] >= schedule["interval"]:
                         guild = self.bot.get_guild(int(guild_id))
                         if guild:
                             try:
@@ -117,6 +172,30 @@ class ServerManager(commands.Cog):
         except Exception as e:
             self.logger.error(f"Error in check_server_settings task: {e}")
 
+    @tasks.loop(seconds=5)
+    async def flush_analytics(self):
+        """Periodically persist buffered broadcast analytics"""
+        try:
+            await self._flush_analytics()
+        except Exception as e:
+            self.logger.error(f"Error flushing broadcast analytics: {e}")
+
+    async def _flush_analytics(self):
+        """Write the analytics shards that changed since the last flush
+
+        Analytics are best-effort: a crash loses at most one flush interval
+        of updates, so shards are written with a plain save (no fsync or
+        atomic rename).
+        """
+        async with self._analytics_lock:
+            for shard in list(self._analytics_dirty):
+                data = self._analytics if shard == "global" else self._server_analytics[shard]
+                if await self.bot.data_manager.save(self.analytics_key, str(shard), data):
+                    self._analytics_dirty.discard(shard)
+                    if shard != "global":
+                        # Only unwritten guild shards stay in memory; the next update reloads it
+                        del self._server_analytics[shard]
+
     @commands.cooldown(1, 30, commands.BucketType.guild)
     @app_commands.command(
         name="createautochannel",
@@ -328,8 +407,39 @@ class ServerManager(commands.Cog):
         """Called when the cog is loaded"""
         await self.init_data()
         await self._init_broadcast_data()
+        config = await self.bot.data_manager.load_json("server_config", self.server_key)
+        self._audit_channels = {
+            int(guild_id): audit_config
+            for guild_id, audit_config in config.get("audit_log", {}).items()
+        }
+        await self._load_analytics()
+        self.flush_analytics.start()
         self.ready.set()
 
+    async def _load_analytics(self):
+        """Load the global analytics shard into memory"""
+        if not await self.bot.data_manager.exists(self.analytics_key, "global"):
+            await self._init_analytics_data()
+        self._analytics = await self.bot.data_manager.load_json(self.analytics_key, "global")
+        # Shards written by hand or by older versions may lack the overview entirely
+        defaults = _default_global_stats()
+        global_stats = self._analytics.setdefault("global_stats", defaults)
+        for key, value in defaults.items():
+            if key != "hourly_stats":
+                global_stats.setdefault(key, value)
+        # Analytics files written before hourly tracking existed lack the buckets,
+        # and older ones stored them as a dict keyed by the stringified hour
+        hourly = global_stats.get("hourly_stats")
+        if not isinstance(hourly, list):
+            hourly = hourly or {}
+            global_stats["hourly_stats"] = [hourly.get(str(i), 0) for i in range(24)]
+            self._analytics_dirty.add("global")
+        # Guild IDs are ints in memory; JSON lists keep them as ints on disk too
+        self._analytics["top_servers"] = [
+            [int(guild_id), successful, reach]
+            for guild_id, successful, reach in self._analytics.get("top_servers", [])
+        ]
+
     async def init_data(self):
         """Initialize server configuration"""
         if not await self.bot.data_manager.exists("server_config", key=self.server_key):
@@ -352,48 +462,97 @@ class ServerManager(commands.Cog):
                 "activity_tracking": {},# guild_id -> {hour: activity_count}
                 "milestones": {},       # guild_id -> {milestone_type: last_value}
                 "backups": {},          # guild_id -> {timestamp: backup_data}
-                "backup_schedule": {},   # guild_id -> {interval, last_backup}
-                "broadcasts": {         # Merged from broadcast.py
-                    "templates": {},    # template_name -> message_template
-                    "schedules": {},    # schedule_id -> {channel_id, template, interval}
-                    "channels": {},     # channel_id -> {enabled: bool, filters: []}
-                    "history": {},      # message_id -> {template, timestamp}
-                    "settings": {
-                        "max_history": 100,
-                        "default_interval": 3600,
-                        "rate_limit": 5
-                    }
-                }
+                "backup_schedule": {}   # guild_id -> {interval, last_backup}
             }
             await self.bot.data_manager.save_json("server_config", self.server_key, default_config)
 
     async def _init_broadcast_data(self):
-        """Initialize broadcast analytics"""
-        if not await self.bot.data_manager.exists(self.analytics_key):
-            await self.bot.data_manager.save(self.analytics_key, 'default', {
-                "broadcasts": {},
-                "server_stats": {},
-                "global_stats": {
+        """Initialize broadcast shards, moving any legacy copy out of server_config"""
+        # Broadcast sections live in their own files so a change to one
+        # (e.g. a new schedule) doesn't rewrite the others or server_config.
+        async with self.config_lock:
+            config = await self.bot.data_manager.load_json("server_config", self.server_key)
+            legacy = config.get("broadcasts", {})
+            migrated = True
+            for shard, default in BROADCAST_SHARDS.items():
+                if await self.bot.data_manager.exists(self.broadcast_dir, shard):
+                    continue
+                if not await self._save_broadcast_shard(shard, legacy.get(shard, default)):
+                    migrated = False
+
+            # Once every shard is written, drop the stale copy so later server_config saves skip it
+            if migrated and "broadcasts" in config:
+                del config["broadcasts"]
+                await self.bot.data_manager.save_json("server_config", self.server_key, config)
+
+    async def _init_analytics_data(self):
+        """Create the global analytics shard, splitting up a legacy analytics file if there is one"""
+        # Analytics are sharded too: a small "global" shard with the overview
+        # and a precomputed top 5, plus one shard per guild.
+        legacy = {}
+        if await self.bot.data_manager.exists(self.analytics_key):
+            legacy = await self.bot.data_manager.load_json(self.analytics_key)
+        server_stats = legacy.get("server_stats", {})
+        for guild_id, stats in server_stats.items():
+            await self.bot.data_manager.save(self.analytics_key, guild_id, stats)
+
+        global_stats = legacy.get("global_stats") or _default_global_stats()
+        active = [stats for stats in server_stats.values() if stats["successful_broadcasts"]]
+        global_stats["_active_servers"] = len(active)
+        global_stats["_total_successful"] = sum(stats["successful_broadcasts"] for stats in active)
+        top_servers = heapq.nlargest(
+            5,
+            server_stats.items(),
+            key=lambda x: x[1]["successful_broadcasts"]
+        )
+        await self.bot.data_manager.save(self.analytics_key, "global", {
+            "global_stats": global_stats,
+            "top_servers": [
+                [int(guild_id), stats["successful_broadcasts"], stats["total_reach"]]
+                for guild_id, stats in top_servers
+            ]
+        })
+
+    async def _get_server_analytics(self, guild_id: int) -> dict:
+        """Return a guild's analytics shard, loading it on first use"""
+        stats = self._server_analytics.get(guild_id)
+        if stats is None:
+            key = str(guild_id)
+            if await self.bot.data_manager.exists(self.analytics_key, key):
+                stats = await self.bot.data_manager.load_json(self.analytics_key, key)
+            else:
+                stats = {
                     "total_broadcasts": 0,
+                    "successful_broadcasts": 0,
+                    "failed_broadcasts": 0,
                     "total_reach": 0,
-                    "most_active_hour": None,
-                    "avg_engagement": 0
+                    "last_broadcast": None
                 }
-            })
+            self._server_analytics[guild_id] = stats
+        return stats
+
+    async def _load_broadcast_shard(self, shard: str) -> dict:
+        """Load a single broadcast section"""
+        return await self.bot.data_manager.load_json(self.broadcast_dir, shard)
+
+    async def _save_broadcast_shard(self, shard: str, data: dict) -> bool:
+        """Save a single broadcast section"""
+        return await self.bot.data_manager.save_json(self.broadcast_dir, shard, data)
 
     async def get_active_members(self, guild: discord.Guild) -> list:
         """Get list of members active in the last 24 hours"""
         one_day_ago = datetime.utcnow() - timedelta(days=1)
-        active_members = set()
+        semaphore = asyncio.Semaphore(5)  # Bound concurrent history requests
         
-        for channel in guild.text_channels:
-            try:
-                async for message in channel.history(after=one_day_ago):
-                    active_members.add(message.author.id)
-            except discord.Forbidden:
-                continue
-                
-        return list(active_members)
+        async def scan_channel(channel: discord.TextChannel) -> set:
+            async with semaphore:
+                try:
+                    return {message.author.id async for message in channel.history(after=one_day_ago)}
+                except discord.Forbidden:
+                    return set()
+        
+        results = await asyncio.gather(*(scan_channel(channel) for channel in guild.text_channels))
+        return list(set().union(*results))
 
     @commands.cooldown(1, 30, commands.BucketType.guild)
     @app_commands.command(
@@ -453,7 +612,13 @@ class ServerManager(commands.Cog):
                     "filters": events.split(',') if events != "all" else "all"
                 }
                 
-                await self.bot.data_manager.save_json("server_config", self.server_key, config)
+                if not await self.bot.data_manager.save_json("server_config", self.server_key, config):
+                    await interaction.response.send_message(
+                        "❌ Failed to save the audit log settings. Please try again later.",
+                        ephemeral=True
+                    )
+                    return
+                self._audit_channels[interaction.guild_id] = config["audit_log"][guild_id]
                 
                 # Set up channel permissions
                 try:
@@ -781,13 +946,10 @@ class ServerManager(commands.Cog):
         message: str
     ):
         """Log an audit event"""
-        config = await self.bot.data_manager.load_json("server_config", self.server_key)
-        guild_id = str(guild.id)
-        
-        if guild_id not in config.get("audit_log", {}):
+        audit_config = self._audit_channels.get(guild.id)
+        if audit_config is None:
             return
             
-        audit_config = config["audit_log"][guild_id]
         if audit_config["filters"] != "all" and event_type not in audit_config["filters"]:
             return
             
@@ -828,34 +990,20 @@ class ServerManager(commands.Cog):
         """
         try:
             target_channel = channel or interaction.channel
-            
-            # Create embed
-            embed = discord.Embed(
-                title="📢 Server Broadcast",
-                description=message,
-                color=discord.Color.blue(),
-                timestamp=datetime.utcnow()
-            )
-            
-            if role:
-                content = role.mention
-            else:
-                content = None
                 
             # Handle scheduling
             if schedule:
                 schedule_id = str(uuid.uuid4())
-                broadcast_data = {
-                    "channel_id": target_channel.id,
-                    "message": message,
-                    "role_id": role.id if role else None,
-                    "schedule": schedule,
-                    "last_sent": None
-                }
+                broadcast_data = BroadcastSchedule(
+                    channel_id=target_channel.id,
+                    message=message,
+                    schedule=schedule,
+                    role_id=role.id if role else None
+                )
                 
-                config = await self.bot.data_manager.load_json("server_config", self.server_key)
-                config["broadcasts"]["schedules"][schedule_id] = broadcast_data
-                await self.bot.data_manager.save_json("server_config", self.server_key, config)
+                schedules = await self._load_broadcast_shard("schedules")
+                schedules[schedule_id] = broadcast_data.to_dict()
+                await self._save_broadcast_shard("schedules", schedules)
                 
                 await interaction.response.send_message(
                     f"✅ Broadcast scheduled in {target_channel.mention}!",
@@ -863,7 +1011,13 @@ class ServerManager(commands.Cog):
                 )
             else:
                 # Send immediate broadcast
-                await target_channel.send(content=content, embed=embed)
+                embed = discord.Embed(
+                    title="📢 Server Broadcast",
+                    description=message,
+                    color=discord.Color.blue(),
+                    timestamp=datetime.utcnow()
+                )
+                await target_channel.send(content=role.mention if role else None, embed=embed)
                 await interaction.response.send_message(
                     f"✅ Broadcast sent to {target_channel.mention}!",
                     ephemeral=True
@@ -871,9 +1025,9 @@ class ServerManager(commands.Cog):
                 
             # Update analytics
             await self._update_broadcast_stats(
-                str(interaction.guild_id),
+                interaction.guild_id,
                 True,
-                len(interaction.guild.members)
+                interaction.guild.member_count or 0  # None when member data isn't available
             )
             
         except Exception as e:
@@ -887,8 +1041,7 @@ class ServerManager(commands.Cog):
     @app_commands.checks.has_permissions(manage_messages=True)
     async def list_broadcasts(self, interaction: discord.Interaction):
         """List all scheduled broadcasts"""
-        config = await self.bot.data_manager.load_json("server_config", self.server_key)
-        schedules = config["broadcasts"]["schedules"]
+        schedules = await self._load_broadcast_shard("schedules")
         
         if not schedules:
             await interaction.response.send_message(
@@ -903,12 +1056,13 @@ class ServerManager(commands.Cog):
         )
         
         for schedule_id, data in schedules.items():
-            channel = self.bot.get_channel(data["channel_id"])
+            entry = BroadcastSchedule.from_dict(data)
+            channel = self.bot.get_channel(entry.channel_id)
             channel_name = channel.mention if channel else "Unknown Channel"
             
             embed.add_field(
                 name=f"ID: {schedule_id[:8]}",
-                value=f"Channel: {channel_name}\nSchedule: {data['schedule']}\nMessage: {data['message'][:50]}...",
+                value=f"Channel: {channel_name}\nSchedule: {entry.schedule}\nMessage: {entry.message[:50]}...",
                 inline=False
             )
             
@@ -927,11 +1081,11 @@ class ServerManager(commands.Cog):
         Args:
             schedule_id: ID of the scheduled broadcast
         """
-        config = await self.bot.data_manager.load_json("server_config", self.server_key)
+        schedules = await self._load_broadcast_shard("schedules")
         
-        if schedule_id in config["broadcasts"]["schedules"]:
-            del config["broadcasts"]["schedules"][schedule_id]
-            await self.bot.data_manager.save_json("server_config", self.server_key, config)
+        if schedule_id in schedules:
+            del schedules[schedule_id]
+            await self._save_broadcast_shard("schedules", schedules)
             
             await interaction.response.send_message(
                 "✅ Broadcast cancelled successfully!",
@@ -943,29 +1097,51 @@ class ServerManager(commands.Cog):
                 ephemeral=True
             )
 
-    async def _update_broadcast_stats(self, guild_id: str, success: bool, member_count: int):
-        """Update broadcast analytics"""
-        analytics = await self.bot.data_manager.load(self.analytics_key)
-        
-        if guild_id not in analytics["server_stats"]:
-            analytics["server_stats"][guild_id] = {
-                "total_broadcasts": 0,
-                "successful_broadcasts": 0,
-                "failed_broadcasts": 0,
-                "total_reach": 0,
-                "last_broadcast": None
-            }
-        
-        stats = analytics["server_stats"][guild_id]
+    async def _update_broadcast_stats(self, guild_id: int, success: bool, member_count: int):
+        """Update broadcast analytics in memory; flush_analytics persists them"""
+        async with self._analytics_lock:
+            if self._analytics is None:
+                await self._load_analytics()
+            global_stats = self._analytics["global_stats"]
+            global_stats.setdefault("_active_servers", 0)    # servers with at least one successful broadcast
+            global_stats.setdefault("_total_successful", 0)
+            stats = await self._get_server_analytics(guild_id)
+            self._apply_broadcast_stats(guild_id, stats, success, member_count, datetime.utcnow())
+            self._analytics_dirty.update((guild_id, "global"))
+
+    def _apply_broadcast_stats(self, guild_id: int, stats: dict, success: bool, member_count: int, now: datetime):
+        """Apply one broadcast result to a guild shard and the global shard; caller holds the lock"""
+        analytics = self._analytics
+        global_stats = analytics["global_stats"]
+
         stats["total_broadcasts"] += 1
+        global_stats["total_broadcasts"] += 1
         if success:
+            if stats["successful_broadcasts"] == 0:
+                global_stats["_active_servers"] += 1
             stats["successful_broadcasts"] += 1
             stats["total_reach"] += member_count
+            global_stats["_total_successful"] += 1
+            global_stats["total_reach"] += member_count
+            global_stats["avg_engagement"] = global_stats["_total_successful"] / global_stats["_active_servers"]
+
+            # Keep the top 5 current so readers never scan every shard
+            top_servers = [entry for entry in analytics["top_servers"] if entry[0] != guild_id]
+            if len(top_servers) < 5 or stats["successful_broadcasts"] > min(entry[1] for entry in top_servers):
+                top_servers.append([guild_id, stats["successful_broadcasts"], stats["total_reach"]])
+                top_servers = heapq.nlargest(5, top_servers, key=lambda entry: entry[1])
+            analytics["top_servers"] = top_servers
         else:
             stats["failed_broadcasts"] += 1
-        stats["last_broadcast"] = datetime.utcnow().isoformat()
-        
-        await self.bot.data_manager.save(self.analytics_key, analytics)
+        stats["last_broadcast"] = now.isoformat()
+
+        # Counts only grow, so the busiest hour can only change to the one just incremented
+        hourly = global_stats["hourly_stats"]
+        hour = now.hour
+        hourly[hour] += 1
+        best_hour = global_stats["most_active_hour"]
+        if best_hour is None or hourly[hour] > hourly[best_hour]:
+            global_stats["most_active_hour"] = hour
 
 async def setup(bot):
     """Add the cog to the bot."""
@@ -521,7 +521,7 @@ class Social(commands.Cog):
             # Check if user has enough coins
             economy_cog = interaction.client.get_cog("Economy")
             if economy_cog:
-                user_data = economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
+                user_data = await economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
                 if user_data["balance"] < self.marriage_cost:
                     await interaction.response.send_message(
                         f"💔 Marriage costs 🪙 {self.marriage_cost:,} coins! You only have 🪙 {user_data['balance']:,}.",
@@ -592,9 +592,9 @@ class Social(commands.Cog):
             elif view.value:
                 # Deduct coins
                 if economy_cog:
-                    user_data = economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
+                    user_data = await economy_cog._get_user_data(interaction.guild_id, interaction.user.id)
                     user_data["balance"] -= self.marriage_cost
-                    economy_cog._save_user_data(interaction.guild_id, interaction.user.id, user_data)
+                    await economy_cog._save_user_data(interaction.guild_id, interaction.user.id, user_data)
 
                 # Create marriage
                 data['marriages'][str(interaction.user.id)] = user.id
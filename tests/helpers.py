@@ -0,0 +1,42 @@
+import copy
+
+class FakeDataManager:
+    """In-memory stand-in for DataManager; saves fail while fail_saves > 0"""
+    def __init__(self):
+        self.guild_data = {}  # (guild_id, data_type) -> data
+        self.json_data = {}  # (data_type, key) -> data
+        self.saves = []  # guild_id of every successful save_data, in order
+        self.fail_saves = 0
+
+    def _save_fails(self) -> bool:
+        if self.fail_saves:
+            self.fail_saves -= 1
+            return True
+        return False
+
+    def load_data(self, guild_id, data_type):
+        if (guild_id, data_type) not in self.guild_data:
+            raise FileNotFoundError(data_type)
+        return copy.deepcopy(self.guild_data[(guild_id, data_type)])
+
+    def save_data(self, guild_id, data_type, data):
+        if self._save_fails():
+            raise OSError("disk full")
+        self.saves.append(guild_id)
+        self.guild_data[(guild_id, data_type)] = copy.deepcopy(data)
+
+    async def exists(self, data_type, key="default"):
+        return (data_type, key) in self.json_data
+
+    async def load_json(self, data_type, key="default"):
+        return copy.deepcopy(self.json_data.get((data_type, key), {}))
+
+    async def save_json(self, data_type, key, data):
+        # Like DataManager, JSON saves report failure instead of raising
+        if self._save_fails():
+            return False
+        self.json_data[(data_type, key)] = copy.deepcopy(data)
+        return True
+
+    load = load_json
+    save = save_json
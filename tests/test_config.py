@@ -0,0 +1,76 @@
+import unittest
+from types import SimpleNamespace
+from cogs.config import Config
+from tests.helpers import FakeDataManager
+
+class TestConfig(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data_manager = FakeDataManager()
+        self.cog = Config(SimpleNamespace(data_manager=self.data_manager))
+        self.cog.config_flush_delay = 0
+
+    async def test_changes_are_coalesced_into_one_write(self):
+        self.cog._save_config(1, self.cog._create_default_config())
+        newer = self.cog._get_config_mutable(1)
+        newer["economy"]["daily_amount"] = "250"
+        self.cog._save_config(1, newer)
+
+        await self.cog._flush_tasks[1]
+
+        self.assertEqual(self.data_manager.saves, [1])
+        self.assertEqual(self.data_manager.guild_data[(1, "config")]["economy"]["daily_amount"], "250")
+        self.assertFalse(self.cog._dirty_configs)
+        self.assertFalse(self.cog._flush_tasks)
+
+    async def test_failed_write_is_retried_and_flushed_on_unload(self):
+        self.cog.config_retry_delay = 3600
+        self.data_manager.fail_saves = 1
+        config = self.cog._create_default_config()
+        self.cog._save_config(1, config)
+
+        await self.cog._flush_tasks[1]
+        self.assertIs(self.cog._dirty_configs[1], config)
+        self.assertIn(1, self.cog._flush_tasks)  # Retry scheduled
+
+        await self.cog.cog_unload()
+        self.assertEqual(self.data_manager.guild_data[(1, "config")], config)
+        self.assertFalse(self.cog._dirty_configs)
+        self.assertFalse(self.cog._flush_tasks)
+
+    async def test_failed_write_does_not_replace_newer_config(self):
+        newer = self.cog._create_default_config()
+        newer["economy"]["daily_amount"] = "250"
+
+        def save_data(guild_id, data_type, data):
+            # A command changes the config while this write is in flight, then the write fails
+            self.cog._dirty_configs[guild_id] = newer
+            raise OSError("disk full")
+
+        self.data_manager.save_data = save_data
+        self.cog._flush_now.set()  # Don't schedule a retry; only the re-queue is under test
+        self.cog._save_config(1, self.cog._create_default_config())
+        await self.cog._flush_tasks[1]
+
+        self.assertIs(self.cog._dirty_configs[1], newer)
+
+    async def test_get_config_prefers_unwritten_config(self):
+        self.data_manager.guild_data[(1, "config")] = self.cog._create_default_config()
+        pending = self.cog._create_default_config()
+        pending["economy"]["daily_amount"] = "250"
+        self.cog._dirty_configs[1] = pending
+
+        self.assertIs(self.cog._get_config(1), pending)
+
+    async def test_cache_evicts_least_recently_used(self):
+        self.cog.cache_max_size = 2
+        for guild_id in (1, 2):
+            self.data_manager.guild_data[(guild_id, "config")] = {"economy": {}}
+            self.cog._get_config(guild_id)
+        self.cog._get_config(1)  # Guild 1 is now the most recently used
+
+        self.cog._cache_config(3, {"economy": {}})
+
+        self.assertEqual(list(self.cog._config_cache), [1, 3])
+
+if __name__ == '__main__':
+    unittest.main()
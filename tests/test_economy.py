@@ -0,0 +1,137 @@
+import asyncio
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from cogs.economy import Economy
+from tests.helpers import FakeDataManager
+
+class TestEconomy(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data_manager = FakeDataManager()
+        self.bot = SimpleNamespace(
+            data_manager=self.data_manager,
+            config_manager=MagicMock(get_value=MagicMock(return_value=100)),
+            wait_until_ready=AsyncMock()
+        )
+        self.cog = Economy(self.bot)
+
+    async def asyncTearDown(self):
+        if self.cog.flush_economy_data.is_running():
+            self.cog.flush_economy_data.cancel()
+        for task in list(self.cog._giveaway_tasks.values()):
+            task.cancel()
+
+    async def test_unload_flushes_pending_changes(self):
+        await self.cog.cog_load()
+        user_data = await self.cog._get_user_data(1, 42)
+        user_data["balance"] += 50
+        await self.cog._save_user_data(1, 42, user_data)
+
+        await self.cog.cog_unload()
+
+        self.assertEqual(self.data_manager.guild_data[(1, "economy")]["42"]["balance"], 150)
+        self.assertFalse(self.cog._dirty_guilds)
+
+    async def test_unload_waits_for_running_flush(self):
+        await self.cog._save_user_data(1, 42, {"balance": 100})
+        save_data = self.data_manager.save_data
+
+        def slow_save(guild_id, data_type, data):
+            time.sleep(0.05)
+            save_data(guild_id, data_type, data)
+
+        self.data_manager.save_data = slow_save
+        flush = asyncio.create_task(self.cog._flush_dirty_guilds())
+        await asyncio.sleep(0)  # Let the flush take the lock and start writing
+
+        await self.cog.cog_unload()
+
+        self.assertTrue(flush.done() and not flush.cancelled())
+        self.assertEqual(self.data_manager.saves, [1])
+        self.assertFalse(self.cog._dirty_guilds)
+
+    async def test_failed_save_is_requeued(self):
+        await self.cog._save_user_data(1, 42, {"balance": 100})
+        self.data_manager.fail_saves = 1
+
+        await self.cog._flush_dirty_guilds()
+        self.assertIn(1, self.cog._dirty_guilds)
+        self.assertNotIn((1, "economy"), self.data_manager.guild_data)
+
+        await self.cog._flush_dirty_guilds()
+        self.assertFalse(self.cog._dirty_guilds)
+        self.assertIn("42", self.data_manager.guild_data[(1, "economy")])
+    async def test_cancelled_flush_requeues_its_batch(self):
+        await self.cog._save_user_data(1, 42, {"balance": 100})
+        self.data_manager.save_data = lambda *args: time.sleep(0.05)
+        flush = asyncio.create_task(self.cog._flush_dirty_guilds())
+        await asyncio.sleep(0.01)  # Let the flush start writing
+
+        flush.cancel()
+        await asyncio.gather(flush, return_exceptions=True)
+
+        self.assertIn(1, self.cog._dirty_guilds)
+        self.assertFalse(self.cog._flushing_guilds)
+
+    async def test_lookup_alone_does_not_mark_guild_dirty(self):
+        user_data = await self.cog._get_user_data(1, 42)
+
+        self.assertEqual(user_data["balance"], 100)
+        self.assertFalse(self.cog._dirty_guilds)
+        await self.cog._flush_dirty_guilds()
+        self.assertEqual(self.data_manager.saves, [])
+
+    async def test_eviction_keeps_unwritten_guilds(self):
+        self.cog.cache_max_guilds = 1
+        await self.cog._save_user_data(1, 42, {"balance": 100})
+        await self.cog._get_guild_data(2)
+        self.assertIn(1, self.cog._guild_cache)
+
+        await self.cog._flush_dirty_guilds()
+        await self.cog._get_guild_data(3)
+        self.assertNotIn(1, self.cog._guild_cache)
+        self.assertIn(3, self.cog._guild_cache)
+
+    async def test_eviction_drops_load_locks(self):
+        self.cog.cache_max_guilds = 1
+        for guild_id in (1, 2, 3):
+            await self.cog._get_guild_data(guild_id)
+
+        self.assertEqual(list(self.cog._load_locks), [3])
+    async def test_load_giveaways_restarts_timers(self):
+        giveaway = {"prize": "Nitro", "winners": 1, "end_time": time.time() - 1}
+        self.data_manager.json_data[("giveaways", "active")] = {"123": {"456": giveaway}}
+        self.cog._end_giveaway = AsyncMock()
+
+        await self.cog._load_giveaways()
+
+        self.assertEqual(self.cog.active_giveaways, {123: {456: giveaway}})
+        await self.cog._giveaway_tasks[456]
+        self.cog._end_giveaway.assert_awaited_once_with(123, 456)
+        self.assertNotIn(456, self.cog._giveaway_tasks)
+
+    async def test_remove_giveaway_persists_remaining(self):
+        self.cog.active_giveaways = {123: {456: {"prize": "A"}, 789: {"prize": "B"}}}
+
+        await self.cog._remove_giveaway(123, 456)
+        self.assertEqual(self.data_manager.json_data[("giveaways", "active")], {123: {789: {"prize": "B"}}})
+
+        await self.cog._remove_giveaway(123, 789)
+        self.assertEqual(self.cog.active_giveaways, {})
+        self.assertEqual(self.data_manager.json_data[("giveaways", "active")], {})
+
+    async def test_unload_cancels_giveaway_timers(self):
+        self.cog.active_giveaways = {123: {456: {"end_time": time.time() + 3600}}}
+        self.cog._start_giveaway_timer(123, 456)
+        task = self.cog._giveaway_tasks[456]
+        await asyncio.sleep(0)
+
+        await self.cog.cog_unload()
+        await asyncio.gather(task, return_exceptions=True)
+
+        self.assertTrue(task.cancelled())
+        self.assertIn(456, self.cog.active_giveaways[123])  # Still saved, so the next load resumes it
+
+if __name__ == '__main__':
+    unittest.main()
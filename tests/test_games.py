@@ -0,0 +1,46 @@
+import copy
+import unittest
+from types import SimpleNamespace
+from cogs.games import Games
+from tests.helpers import FakeDataManager
+
+class ShallowCopyDataManager(FakeDataManager):
+    """Shares nested dicts between load_data results, as DataManager's cache does"""
+    def load_data(self, guild_id, data_type):
+        if (guild_id, data_type) not in self.guild_data:
+            raise FileNotFoundError(data_type)
+        return self.guild_data[(guild_id, data_type)].copy()
+
+class TestGames(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data_manager = ShallowCopyDataManager()
+        self.cog = Games(SimpleNamespace(data_manager=self.data_manager))
+        self.stored = {self.cog.games_key: {"1": copy.deepcopy(self.cog.default_config)}}
+        self.data_manager.guild_data[("1", "games")] = self.stored
+
+    async def test_get_config_does_not_share_stored_dicts(self):
+        config = await self.cog.get_config("1")
+        config["enabled_games"].remove("gamble")
+
+        self.assertIn("gamble", self.stored[self.cog.games_key]["1"]["enabled_games"])
+
+    async def test_update_config_refreshes_cache(self):
+        await self.cog.get_config("1")
+
+        self.assertTrue(await self.cog.update_config("1", "cooldown", 5))
+
+        self.assertEqual((await self.cog.get_config("1"))["cooldown"], 5)
+        self.assertEqual(self.data_manager.guild_data[("1", "games")][self.cog.games_key]["1"]["cooldown"], 5)
+
+    async def test_failed_update_leaves_config_unchanged(self):
+        config = await self.cog.get_config("1")
+        self.data_manager.fail_saves = 1
+
+        self.assertFalse(await self.cog.update_config("1", "cooldown", 5))
+
+        self.assertEqual(config["cooldown"], 60)
+        self.assertEqual((await self.cog.get_config("1"))["cooldown"], 60)
+        self.assertEqual(self.stored[self.cog.games_key]["1"]["cooldown"], 60)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import logging
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from cogs.server_manager import ServerManager
+from tests.helpers import FakeDataManager
+
+class TestServerManager(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.data_manager = FakeDataManager()
+        self.cog = ServerManager(SimpleNamespace(
+            data_manager=self.data_manager,
+            logger=logging.getLogger("test")
+        ))
+
+    async def asyncTearDown(self):
+        self.cog.check_server_settings.cancel()
+        self.cog.flush_analytics.cancel()
+
+    async def test_legacy_broadcasts_move_out_of_server_config(self):
+        schedules = {"abc": {"channel_id": 1, "message": "hi", "schedule": "daily"}}
+        self.data_manager.json_data[("server_config", "server_settings")] = {
+            "prefix": "!",
+            "broadcasts": {"schedules": schedules}
+        }
+
+        await self.cog._init_broadcast_data()
+
+        self.assertEqual(self.data_manager.json_data[("broadcasts", "schedules")], schedules)
+        self.assertEqual(self.data_manager.json_data[("server_config", "server_settings")], {"prefix": "!"})
+
+    async def test_legacy_broadcasts_kept_until_every_shard_is_written(self):
+        config = {"broadcasts": {"templates": {"hello": "Hello!"}}}
+        self.data_manager.json_data[("server_config", "server_settings")] = config
+        self.data_manager.fail_saves = 1
+
+        await self.cog._init_broadcast_data()
+
+        self.assertEqual(self.data_manager.json_data[("server_config", "server_settings")], config)
+
+    async def test_failed_audit_log_save_is_reported(self):
+        self.cog._validate_channel_permissions = AsyncMock(return_value=True)
+        interaction = MagicMock(guild_id=1)
+        interaction.response.send_message = AsyncMock()
+        self.data_manager.fail_saves = 1
+
+        await ServerManager.set_audit_log.callback(self.cog, interaction, MagicMock(id=2))
+
+        self.assertNotIn(1, self.cog._audit_channels)
+        self.assertIn("Failed", interaction.response.send_message.await_args.args[0])
+
+    async def test_load_analytics_only_creates_the_analytics_shard(self):
+        await self.cog._load_analytics()
+
+        self.assertIn(("broadcast_analytics", "global"), self.data_manager.json_data)
+        self.assertFalse([key for key in self.data_manager.json_data if key[0] == "broadcasts"])
+
+    async def test_load_analytics_fills_in_missing_global_stats(self):
+        self.data_manager.json_data[("broadcast_analytics", "global")] = {"top_servers": [["7", 3, 30]]}
+
+        await self.cog._load_analytics()
+
+        global_stats = self.cog._analytics["global_stats"]
+        self.assertEqual(global_stats["total_broadcasts"], 0)
+        self.assertEqual(global_stats["hourly_stats"], [0] * 24)
+        self.assertEqual(self.cog._analytics["top_servers"], [[7, 3, 30]])
+
+    async def test_written_guild_shards_are_dropped_from_memory(self):
+        await self.cog._load_analytics()
+        await self.cog._update_broadcast_stats(1, True, 10)
+        self.assertIn(1, self.cog._server_analytics)
+
+        await self.cog._flush_analytics()
+        self.assertNotIn(1, self.cog._server_analytics)
+        self.assertEqual(self.data_manager.json_data[("broadcast_analytics", "1")]["total_reach"], 10)
+
+        # The next update reloads the shard rather than starting over
+        await self.cog._update_broadcast_stats(1, True, 5)
+        self.assertEqual(self.cog._server_analytics[1]["total_reach"], 15)
+
+    async def test_unwritten_guild_shards_stay_in_memory(self):
+        await self.cog._load_analytics()
+        await self.cog._update_broadcast_stats(1, True, 10)
+        self.data_manager.fail_saves = 2  # Both the guild and the global shard
+
+        await self.cog._flush_analytics()
+
+        self.assertIn(1, self.cog._server_analytics)
+        self.assertIn(1, self.cog._analytics_dirty)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,6 +9,23 @@ import asyncpg
 import aiosqlite
 import aiofiles
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+def _json_dumps(data: Any) -> str:
+    """Serialize data for a JSON data file, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data, indent=4)
+
+def _json_loads(content: str) -> Any:
+    """Parse a JSON data file, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 class DataManagerError(Exception):
     """Base exception class for DataManager errors."""
     pass
@@ -207,119 +224,6 @@ class DataManager:
             self.logger.error(f"Failed to update user profile: {e}")
             return False  # Return False on error
     
-    async def save_json(self, table: str, key: str, data: dict) -> bool:
-        """Save JSON data to the database"""
-        try:
-            json_data = json.dumps(data)
-            if self.database_url:
-                # PostgreSQL
-                async with self.pool.acquire() as conn:
-                    await conn.execute(
-                        """
-                        INSERT INTO key_value_store (table_name, key, data)
-                        VALUES ($1, $2, $3)
-                        ON CONFLICT (table_name, key) DO UPDATE SET data = $3
-                        """,
-                        table, key, json_data
-                    )
-            else:
-                # SQLite
-                async with aiosqlite.connect(self.db_path) as conn:
-                    await conn.execute(
-                        """
-                        INSERT OR REPLACE INTO key_value_store (table_name, key, data)
-                        VALUES (?, ?, ?)
-                        """,
-                        (table, key, json_data)
-                    )
-                    await conn.commit()
-            return True
-        except Exception as e:
-            self.logger.error(f"Failed to save JSON data to {table}: {e}")
-            raise DataManagerError(f"Failed to save JSON data: {e}")
-
-    async def load_json(self, table: str, key: str) -> dict:
-        """Load JSON data from the database"""
-        try:
-            if self.database_url:
-                # PostgreSQL
-                async with self.pool.acquire() as conn:
-                    row = await conn.fetchrow(
-                        "SELECT data FROM key_value_store WHERE table_name = $1 AND key = $2",
-                        table, key
-                    )
-                    return json.loads(row['data']) if row else {}
-            else:
-                # SQLite
-                async with aiosqlite.connect(self.db_path) as conn:
-                    async with conn.cursor() as cursor:
-                        await cursor.execute(
-                            "SELECT data FROM key_value_store WHERE table_name = ? AND key = ?",
-                            (table, key)
-                        )
-                        row = await cursor.fetchone()
-                        return json.loads(row[0]) if row else {}
-        except Exception as e:
-            self.logger.error(f"Failed to load JSON data from {table}: {e}")
-            raise DataManagerError(f"Failed to load JSON data: {e}")
-
-    async def exists(self, table: str, key: str = None) -> bool:
-        """Check if a record exists in the database.
-        
-        Args:
-            table (str): The table_name to check in key_value_store
-            key (str, optional): The key to check in key_value_store
-        """
-        try:
-            if self.database_url:
-                # PostgreSQL
-                async with self.pool.acquire() as conn:
-                    if key is not None:
-                        result = await conn.fetchval(
-                            "SELECT EXISTS(SELECT 1 FROM key_value_store WHERE table_name = $1 AND key = $2)",
-                            table, key
-                        )
-                    else:
-                        result = await conn.fetchval(
-                            "SELECT EXISTS(SELECT 1 FROM key_value_store WHERE table_name = $1)",
-                            table
-                        )
-                    return bool(result)
-            else:
-                # SQLite
-                async with aiosqlite.connect(self.db_path) as conn:
-                    async with conn.cursor() as cursor:
-                        if key is not None:
-                            await cursor.execute(
-                                "SELECT EXISTS(SELECT 1 FROM key_value_store WHERE table_name = ? AND key = ?)",
-                                (table, key)
-                            )
-                        else:
-                            await cursor.execute(
-                                "SELECT EXISTS(SELECT 1 FROM key_value_store WHERE table_name = ?)",
-                                (table,)
-                            )
-                        result = await cursor.fetchone()
-                        return bool(result[0]) if result else False
-        except Exception as e:
-            self.logger.error(f"Failed to check existence in {table}: {e}")
-            raise DataManagerError(f"Failed to check existence: {e}")
-
-    async def save(self, table: str, key: str = "default", data: dict = None) -> bool:
-        """Save data to the database.
-        
-        Args:
-            table (str): The table name to save to
-            key (str, optional): The key within the table. Defaults to "default".
-            data (dict, optional): The data to save. Required if key is provided.
-        """
-        if data is None:
-            # If no data provided, assume the key parameter is actually the data
-            data = key
-            key = "default"
-            
-        return await self.save_json(table, key, data)
-
     async def load(self, data_type: str, key: str = "default") -> dict:
         """Load data from JSON file"""
         try:
@@ -329,7 +233,7 @@ class DataManager:
                 
             async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
                 content = await f.read()
-                return json.loads(content) if content else {}
+                return _json_loads(content) if content else {}
         except Exception as e:
             self.logger.error(f"Failed to load JSON data from {data_type}: {str(e)}")
             return {}
@@ -341,7 +245,7 @@ class DataManager:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=4))
+                await f.write(_json_dumps(data))
             return True
         except Exception as e:
             self.logger.error(f"Failed to save JSON data to {data_type}: {str(e)}")
@@ -365,7 +269,7 @@ class DataManager:
             
             async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
                 content = await f.read()
-                return json.loads(content) if content else {}
+                return _json_loads(content) if content else {}
         except Exception as e:
             self.logger.error(f"Failed to load JSON data from {data_type}/{key}: {e}")
             return {}
@@ -377,7 +281,7 @@ class DataManager:
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
             async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=4))
+                await f.write(_json_dumps(data))
             return True
         except Exception as e:
             self.logger.error(f"Failed to save JSON data to {data_type}/{key}: {e}")
@@ -422,7 +326,7 @@ class DataManager:
         try:
             if file_path.exists():
                 with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
+                    data = _json_loads(f.read())
             else:
                 data = {}
             
@@ -446,7 +350,7 @@ class DataManager:
             
             # Save new data
             with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+                f.write(_json_dumps(data))
             self.cache[f"{guild_id}_{data_type}"] = data.copy()
             self.logger.info(f"Saved data for guild {guild_id}, type {data_type}")
         except Exception as e: